@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:07:33 2026
+
+@author: kaiyu.wei
+
+benchmark of the solvers over the bundled scenarios, with fixed seeds. The results are
+stored as json so that runs of different commits can be compared:
+
+    python benchmark.py run --output bench_new.json
+    python benchmark.py compare bench_old.json bench_new.json
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from vessel_allocation_problem import vessel_allocation_problem
+import solving_functions
+from fitness_functions import total_cost, complete_time
+from main import SOLVERS, ITERATION_ARG
+from multi_start import CONSTRUCTIONS
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+class run_monitor:
+    def __init__(self, target_cost):
+        """
+        solver callback that counts the iterations and records when the target cost is reached
+        """
+        self.target_cost = target_cost
+        self.iterations = 0
+        self.t0 = time.perf_counter()
+        self.time_to_target = None
+
+    def __call__(self, iteration, value):
+        self.iterations = iteration
+        if (self.time_to_target is None and self.target_cost is not None
+            and value <= self.target_cost):
+            self.time_to_target = time.perf_counter() - self.t0
+
+def run_benchmark(filename, solver, seed, iterations, target_cost=None,
+                  initial="time_window_size"):
+    """
+    one benchmark run: initial solution and solver with a fixed seed
+
+    Parameters
+    ----------
+    filename : TYPE string
+        DESCRIPTION. the scenario file
+    solver : TYPE string
+        DESCRIPTION. name of the solver in solving_functions
+    seed : TYPE int
+    iterations : TYPE int
+        DESCRIPTION. iteration budget of the solver
+    target_cost : TYPE float, optional
+        DESCRIPTION. the cost for the time-to-target measurement
+    initial : TYPE string, optional
+        DESCRIPTION. the construction heuristic of the initial solution, see
+            multi_start.CONSTRUCTIONS
+
+    Returns
+    -------
+    TYPE dict
+        DESCRIPTION. the measurements of the run
+    """
+    problem = vessel_allocation_problem.from_file(filename)
+    rng = np.random.default_rng(seed)
+    initial_solution = CONSTRUCTIONS[initial](problem, rng)
+    monitor = run_monitor(target_cost)
+    t0 = time.perf_counter()
+    solution = getattr(solving_functions, solver)(initial_solution, rng=rng, callback=monitor,
+                                                  **{ITERATION_ARG[solver]: iterations})
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # kB on Linux
+    return {"scenario": os.path.basename(filename),
+            "solver": solver,
+            "seed": seed,
+            "iterations": monitor.iterations,
+            "time": elapsed,
+            "iterations_per_sec": monitor.iterations / elapsed if elapsed > 0 else None,
+            "target_cost": target_cost,
+            "time_to_target": monitor.time_to_target,
+            "initial": initial,
+            "initial_cost": total_cost(initial_solution),
+            "cost": total_cost(solution),
+            "complete_time": int(complete_time(solution)),
+            "peak_memory_kb": peak}
+
+def git_commit():
+    """
+    the commit of the code being benchmarked, also when run from outside the repository
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args):
+    files = sorted({f for pattern in args.scenarios for f in glob.glob(pattern)})
+    targets = {}
+    if args.targets:
+        with open(args.targets) as f:
+            targets = json.load(f)  # scenario file name -> target cost
+    runs = []
+    # every run gets a fresh process, so that the peak memory belongs to that run only
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+        for filename in files:
+            for solver in args.solvers:
+                for seed in args.seeds:
+                    target = targets.get(os.path.basename(filename))
+                    r = pool.submit(run_benchmark, filename, solver, seed, args.iterations,
+                                    target, args.initial).result()
+                    print(f"{r['scenario']}\t{solver}\tseed {seed}\t"
+                          f"{r['iterations_per_sec']:.0f} it/s\tcost {r['cost']:.2f}")
+                    runs.append(r)
+    result = {"commit": git_commit(),
+              "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+              "python": sys.version.split()[0],
+              "iterations": args.iterations,
+              "initial": args.initial,
+              "seeds": args.seeds,
+              "runs": runs}
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=1)
+    print(f"{len(runs)} runs written to {args.output}")
+
+def summarize(runs):
+    """
+    mean iterations/sec, cost and time to target of the runs per (scenario, solver)
+    """
+    groups = {}
+    for r in runs:
+        groups.setdefault((r["scenario"], r["solver"]), []).append(r)
+    summary = {}
+    for key, group in groups.items():
+        ttt = [r["time_to_target"] for r in group if r["time_to_target"] is not None]
+        summary[key] = {"iterations_per_sec": np.mean([r["iterations_per_sec"] for r in group]),
+                        "cost": np.mean([r["cost"] for r in group]),
+                        "time_to_target": np.mean(ttt) if ttt else None}
+    return summary
+
+def compare(args):
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    old_sum, new_sum = summarize(old["runs"]), summarize(new["runs"])
+    print(f"old: {old['commit']} ({old['created']})   new: {new['commit']} ({new['created']})")
+    print("scenario\tsolver\tit/s old -> new\tcost old -> new")
+    for key in sorted(set(old_sum) & set(new_sum)):
+        o, n = old_sum[key], new_sum[key]
+        speed = 100.0 * (n["iterations_per_sec"] / o["iterations_per_sec"] - 1)
+        quality = 100.0 * (n["cost"] / o["cost"] - 1)
+        print(f"{key[0]}\t{key[1]}\t{o['iterations_per_sec']:.0f} -> {n['iterations_per_sec']:.0f}"
+              f" ({speed:+.1f}%)\t{o['cost']:.2f} -> {n['cost']:.2f} ({quality:+.2f}%)"
+              + (f"\ttime to target {o['time_to_target']:.2f}s -> {n['time_to_target']:.2f}s"
+                 if o["time_to_target"] is not None and n["time_to_target"] is not None else ""))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="benchmark the solvers on the scenarios")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_run = sub.add_parser("run", help="run the benchmark and store the results as json")
+    p_run.add_argument("--scenarios", nargs="+", default=["scenario0?.txt"],
+                       help="scenario files or glob patterns")
+    p_run.add_argument("--solvers", nargs="+", choices=SOLVERS, default=SOLVERS)
+    p_run.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    p_run.add_argument("--iterations", type=int, default=20000)
+    p_run.add_argument("--initial", choices=list(CONSTRUCTIONS), default="time_window_size",
+                       help="construction heuristic of the initial solution")
+    p_run.add_argument("--targets", default=None,
+                       help="json file with a target cost per scenario file name, "
+                            "for the time-to-target measurement")
+    p_run.add_argument("--output", default="benchmark.json")
+    p_cmp = sub.add_parser("compare", help="compare two benchmark json files")
+    p_cmp.add_argument("old")
+    p_cmp.add_argument("new")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:02:51 2026
+
+@author: kaiyu.wei
+
+exact solution of small and medium instances with the CP-SAT solver of OR-Tools
+(pip install ortools), as a reference for the heuristics in solving_functions.
+"""
+import time
+from fitness_functions import total_cost
+from solution_state import instance_data, solution_state, FORBIDDEN
+
+COST_SCALE = 100  # the costs have two decimals, the model needs integer coefficients
+
+def exact_solve(problem, time_limit=60.0, warm_start=None, num_workers=8, log=False):
+    """
+    solve the problem with a constraint program: every vessel gets exactly one allowed berth
+    (handling time != 200), an operation interval inside its time window and inside the
+    open time of the berth, the intervals of a berth do not overlap, and the cost-weighted
+    time in port (leaving - arrival) x cost is minimized.
+
+    Parameters
+    ----------
+    problem : TYPE vessel_allocation_problem object
+        DESCRIPTION. the problem, its allocation is not used or modified
+    time_limit : TYPE float, optional
+        DESCRIPTION. wall-clock budget of the solver in seconds
+    warm_start : TYPE vessel_allocation_problem or solution_state object, optional
+        DESCRIPTION. a complete solution of a heuristic, given to the solver as a hint
+    num_workers : TYPE int, optional
+        DESCRIPTION. number of search threads of CP-SAT
+    log : TYPE bool, optional
+        DESCRIPTION. print the search log of CP-SAT
+
+    Returns
+    -------
+    solution : TYPE vessel_allocation_problem object
+        DESCRIPTION. the best solution found, None if there is none
+    info : TYPE dict
+        DESCRIPTION. status ("OPTIMAL", "FEASIBLE", "INFEASIBLE" or "UNKNOWN"), cost of the
+            solution, bound (the lower bound on the cost proven by the solver),
+            gap ((cost - bound) / cost, 0 if optimal), time, and first_cost, the cost of
+            the first solution found, which is the cost of the warm start if the solver
+            used it (None if no solution was found)
+    """
+    from ortools.sat.python import cp_model  # only imported when the exact solver is used
+    inst = instance_data.from_problem(problem)
+    model = cp_model.CpModel()
+
+    present = {}  # (vessel, berth) -> bool variable, True if the vessel is in the berth
+    starts = {}  # (vessel, berth) -> start time variable of the vessel in the berth
+    earliest_start = {}  # (vessel, berth) -> lower bound of the start time variable
+    intervals = [[] for _ in range(inst.nr_berth)]
+    leave = []  # leaving time variable of every vessel
+    for i in range(inst.nr_vessel):
+        arrival, leaving = inst.arrival_list[i], inst.leaving_list[i]
+        leave.append(model.NewIntVar(arrival, leaving, f"leave_{i}"))
+        berths = []
+        for j in range(inst.nr_berth):
+            handling = inst.handling_list[i][j]
+            earliest = max(arrival, inst.start_list[j])
+            latest = min(leaving, inst.close_list[j]) - handling
+            if handling == FORBIDDEN or earliest > latest:
+                continue  # the vessel cannot be served in this berth
+            x = model.NewBoolVar(f"x_{i}_{j}")
+            s = model.NewIntVar(earliest, latest, f"start_{i}_{j}")
+            intervals[j].append(model.NewOptionalFixedSizeIntervalVar(s, handling, x,
+                                                                       f"op_{i}_{j}"))
+            model.Add(leave[i] == s + handling).OnlyEnforceIf(x)
+            present[i, j] = x
+            starts[i, j] = s
+            earliest_start[i, j] = earliest
+            berths.append(x)
+        model.AddExactlyOne(berths)
+    for j in range(inst.nr_berth):
+        model.AddNoOverlap(intervals[j])
+    weights = [round(c * COST_SCALE) for c in inst.cost_list]
+    model.Minimize(sum(w * (leave[i] - inst.arrival_list[i]) for i, w in enumerate(weights)))
+
+    if warm_start is not None:
+        state = (warm_start if isinstance(warm_start, solution_state)
+                 else solution_state.from_problem(warm_start, inst))
+        # a complete hint (every variable) is checked and taken as the first solution
+        for (i, j), x in present.items():
+            model.AddHint(x, int(state.berth_of[i] == j))
+            if state.berth_of[i] == j:
+                model.AddHint(starts[i, j], state.start[i])
+            else:
+                model.AddHint(starts[i, j], earliest_start[i, j])
+        for i in range(inst.nr_vessel):
+            if state.berth_of[i] >= 0:
+                model.AddHint(leave[i], state.leave[i])
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_search_workers = num_workers
+    solver.parameters.log_search_progress = log
+    first = _first_solution(cp_model)
+    t0 = time.perf_counter()
+    status = solver.Solve(model, first)
+    info = {"status": solver.StatusName(status),
+            "cost": None,
+            "bound": solver.BestObjectiveBound() / COST_SCALE,
+            "gap": None,
+            "time": time.perf_counter() - t0,
+            "first_cost": first.cost}
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None, info
+
+    start = [-1] * inst.nr_vessel
+    sequences = [[] for _ in range(inst.nr_berth)]
+    for (i, j), x in present.items():
+        if solver.BooleanValue(x):
+            start[i] = solver.Value(starts[i, j])
+            sequences[j].append(i)
+    for seq in sequences:
+        seq.sort(key=lambda i : start[i])
+    solution = solution_state.from_allocation(inst, sequences, start).to_problem(problem)
+    objective = solver.ObjectiveValue()
+    info["cost"] = total_cost(solution)
+    info["gap"] = (objective - solver.BestObjectiveBound()) / objective if objective > 0 else 0.0
+    return solution, info
+
+def _first_solution(cp_model):
+    """
+    solution callback that records the cost of the first solution found
+    """
+    class first_solution(cp_model.CpSolverSolutionCallback):
+        def __init__(self):
+            super().__init__()
+            self.cost = None
+
+        def on_solution_callback(self):
+            if self.cost is None:
+                self.cost = self.ObjectiveValue() / COST_SCALE
+    return first_solution()
@@ -5,6 +5,7 @@ Created on Sun Apr  3 11:47:16 2022
 @author: kaiyu.wei
 """
 import numpy as np
+from solution_state import solution_state
 
 def total_cost(problem):
     """
@@ -12,7 +13,7 @@ def total_cost(problem):
 
     Parameters
     ----------
-    problem : TYPE  vessel_allocation_problem object
+    problem : TYPE  vessel_allocation_problem or solution_state object
         DESCRIPTION.
 
     Returns
@@ -20,10 +21,7 @@ def total_cost(problem):
     sum : TYPE  float
         DESCRIPTION.  the total cost of all the vessels
     """
-    total_cost = 0.0   
-    for v in problem.vessels:  
-        total_cost += (v.real_leaving_time - v.arrival) * v.cost
-    return total_cost
+    return problem.total_cost()  # both kinds of solution cache their cost
         
 def complete_time(problem):
     """
@@ -31,7 +29,7 @@ def complete_time(problem):
 
     Parameters
     ----------
-    problem : TYPE  vessel_allocation_problem object
+    problem : TYPE  vessel_allocation_problem or solution_state object
         DESCRIPTION.
 
     Returns
@@ -40,6 +38,8 @@ def complete_time(problem):
         DESCRIPTION.  the general complete time
 
     """
+    if isinstance(problem, solution_state):
+        return problem.complete_time()
     times = []  # list for store work complete times of each berth
     for b in problem.berths:
         if len(b.schedule):  # if the berth still have available time slots
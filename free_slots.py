@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:31:05 2026
+
+@author: kaiyu.wei
+"""
+from bisect import bisect_left, bisect_right
+
+class free_slots:
+    def __init__(self, start, close):
+        """
+        the available time slots of a berth, kept as two sorted lists of slot start and end
+        times. The slots never overlap or touch each other, so a slot can be found by bisect
+        instead of scanning and sorting the whole schedule.
+        It reads like the old list of [start, end] lists: len(), slots[i] and iteration
+        still work.
+
+        Parameters
+        ----------
+        start : TYPE int
+            DESCRIPTION. start time of the berth
+        close : TYPE int
+            DESCRIPTION. close time of the berth, no slot at all if it is not after the start
+        """
+        self.starts = [start] if start < close else []
+        self.ends = [close] if start < close else []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, ind):
+        return [self.starts[ind], self.ends[ind]]
+
+    def __iter__(self):
+        for s, e in zip(self.starts, self.ends):
+            yield [s, e]
+
+    def __eq__(self, rhs):
+        return list(self) == list(rhs)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def find(self, time):
+        """
+        search for the slot in which the time is
+
+        Parameters
+        ----------
+        time : TYPE int
+
+        Returns
+        -------
+        TYPE int
+            DESCRIPTION. index of the slot with start <= time < end, -1 if not found
+        """
+        ind = bisect_right(self.starts, time) - 1
+        if ind >= 0 and time < self.ends[ind]:
+            return ind
+        return -1
+
+    def first_fit(self, earliest, duration, latest_end):
+        """
+        find the first slot in which an operation fits
+
+        Parameters
+        ----------
+        earliest : TYPE int
+            DESCRIPTION. the operation cannot start before this time
+        duration : TYPE int
+            DESCRIPTION. the duration of the operation
+        latest_end : TYPE int
+            DESCRIPTION. the operation should end before this time
+
+        Returns
+        -------
+        TYPE int, int
+            DESCRIPTION. the operation start time and the index of the slot,
+                None and -1 if not found
+        """
+        ind = max(bisect_right(self.starts, earliest) - 1, 0)  # the slots before cannot be used
+        while ind < len(self.starts):
+            op = max(earliest, self.starts[ind])
+            if op + duration > latest_end:
+                break  # the later slots start even later
+            if op + duration <= self.ends[ind]:
+                return op, ind
+            ind += 1
+        return None, -1
+
+    def occupy(self, ind, start, end):
+        """
+        take the time [start, end] from the slot with the index, the rest of the slot
+        is split in at most two slots
+        """
+        slot_start, slot_end = self.starts[ind], self.ends[ind]
+        del self.starts[ind], self.ends[ind]
+        if end != slot_end:
+            self.starts.insert(ind, end)
+            self.ends.insert(ind, slot_end)
+        if slot_start != start:
+            self.starts.insert(ind, slot_start)
+            self.ends.insert(ind, start)
+
+    def release(self, start, end):
+        """
+        give the time [start, end] back, the slot is merged with the slots right before
+        and right after it if there's no gap between them
+        """
+        ind = bisect_left(self.starts, start)
+        if ind > 0 and self.ends[ind - 1] == start:
+            # merge with the previous slot
+            ind -= 1
+            start = self.starts[ind]
+            del self.starts[ind], self.ends[ind]
+        if ind < len(self.starts) and self.starts[ind] == end:
+            # merge with the next slot
+            end = self.ends[ind]
+            del self.starts[ind], self.ends[ind]
+        self.starts.insert(ind, start)
+        self.ends.insert(ind, end)
+
+    def truncate(self, close):
+        """
+        remove the time from close on, when the berth closes earlier
+        """
+        while self.starts and self.starts[-1] >= close:
+            del self.starts[-1], self.ends[-1]
+        if self.ends and self.ends[-1] > close:
+            self.ends[-1] = close
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:41:09 2026
+
+@author: kaiyu.wei
+
+random instances in the layout of Format.txt, for scaling tests beyond the bundled scenarios:
+
+    python instance_generator.py large01.txt --vessels 600 --berths 40 --seed 1
+"""
+import argparse
+import numpy as np
+from solution_state import FORBIDDEN
+
+def generate_instance(num_vessels, num_berths, arrival_density=0.033, forbidden_fraction=0.3,
+                      window_tightness=0.2, rng=None):
+    """
+    draw a random instance. The defaults give instances like the bundled scenarios
+    (60 vessels on 13 berths arrive within about 140 time units). Every instance has a
+    feasible allocation: the departure windows and berth closing times are set around a
+    greedy plan drawn together with the instance.
+
+    Parameters
+    ----------
+    num_vessels : TYPE int
+    num_berths : TYPE int
+    arrival_density : TYPE float, optional
+        DESCRIPTION. expected arrivals per time unit and per berth, the arrivals are spread
+            uniformly over num_vessels / (arrival_density * num_berths) time units
+    forbidden_fraction : TYPE float, optional
+        DESCRIPTION. fraction of the (vessel, berth) pairs with the forbidden handling time
+            (200), every vessel keeps at least one allowed berth
+    window_tightness : TYPE float, optional
+        DESCRIPTION. between 0 and 1, the slack of a vessel between its departure in the
+            greedy plan and its maximum departure time is drawn up to
+            (1 - window_tightness) x the arrival span, so 1 leaves no slack at all
+    rng : TYPE numpy.random.Generator or int, optional
+        DESCRIPTION. the random number generator, or a seed for a new one
+
+    Returns
+    -------
+    TYPE dict
+        DESCRIPTION. arrival, berth_open, handling (vessels x berths), berth_close, leaving
+            and cost, in the order of Format.txt
+    """
+    rng = np.random.default_rng(rng)
+    span = max(int(round(num_vessels / (arrival_density * num_berths))), 1)
+    arrival = rng.integers(0, span + 1, size=num_vessels)
+    berth_open = rng.integers(0, 21, size=num_berths)
+
+    # a vessel has the same handling time on all its allowed berths, as in the bundled scenarios
+    base_handling = rng.integers(6, 49, size=num_vessels)
+    forbidden = rng.random((num_vessels, num_berths)) < forbidden_fraction
+    forbidden[np.arange(num_vessels), rng.integers(0, num_berths, size=num_vessels)] = False
+    handling = np.where(forbidden, FORBIDDEN, base_handling[:, None])
+
+    # plant a feasible plan: every vessel, in arrival order, goes to the allowed berth where
+    # it can start first. The time windows and berth closing times are set around this plan,
+    # so every generated instance can be fully allocated
+    free = berth_open.copy()  # the time each berth becomes free in the plan
+    finish = np.empty(num_vessels, dtype=np.int64)
+    for v in np.argsort(arrival, kind="stable"):
+        allowed = np.flatnonzero(~forbidden[v])
+        starts = np.maximum(free[allowed], arrival[v])
+        b = allowed[np.argmin(starts)]
+        finish[v] = starts.min() + base_handling[v]
+        free[b] = finish[v]
+
+    slack = rng.integers(0, int((1 - window_tightness) * span) + 1, size=num_vessels)
+    leaving = finish + slack
+    berth_close = leaving.max() + rng.integers(0, span // 4 + 1, size=num_berths)
+    cost = np.round(rng.uniform(5, 300, size=num_vessels), 2)
+    return {"arrival": arrival,
+            "berth_open": berth_open,
+            "handling": handling,
+            "berth_close": berth_close,
+            "leaving": leaving,
+            "cost": cost}
+
+def write_instance(filename, instance):
+    """
+    write an instance of generate_instance in the layout read by
+    vessel_allocation_problem.from_file
+    """
+    def line(values, fmt="{}"):
+        return " ".join(fmt.format(x) for x in values) + " \n"
+    with open(filename, "w") as f:
+        f.write(f"{len(instance['arrival'])}\n")
+        f.write(f"{len(instance['berth_open'])}\n")
+        f.write(line(instance["arrival"]))
+        f.write(line(instance["berth_open"]))
+        for row in instance["handling"]:
+            f.write(line(row))
+        f.write(line(instance["berth_close"]))
+        f.write(line(instance["leaving"]))
+        f.write(line(instance["cost"], "{:.2f}"))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="write a random instance in the Format.txt layout")
+    parser.add_argument("output", help="path of the instance file")
+    parser.add_argument("--vessels", type=int, default=600)
+    parser.add_argument("--berths", type=int, default=40)
+    parser.add_argument("--arrival-density", type=float, default=0.033,
+                        help="expected arrivals per time unit and per berth")
+    parser.add_argument("--forbidden-fraction", type=float, default=0.3,
+                        help="fraction of forbidden (vessel, berth) pairs")
+    parser.add_argument("--window-tightness", type=float, default=0.2,
+                        help="0 for loose to 1 for no slack in the departure windows")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    instance = generate_instance(args.vessels, args.berths, args.arrival_density,
+                                 args.forbidden_fraction, args.window_tightness, args.seed)
+    write_instance(args.output, instance)
+    print(f"{args.vessels} vessels and {args.berths} berths written to {args.output}")
@@ -3,84 +3,118 @@
 Created on Fri Apr  1 11:27:20 2022
 
 @author: kaiyu.wei
+
+batch driver: solve a set of scenario files in parallel and write a results table, e.g.
+
+    python main.py "Scenarios-2/scenario*.txt" --solver tabu_search --iterations 50000
+        --workers 8 --output results.csv
 """
-from vessel_allocation_problem import vessel_allocation_problem
-from solving_functions import fcfs, pareto_local_search, alloc_by_time_window_size, local_search, tabu_search, simulated_annealing
+import argparse
+import csv
+import glob
 import os
-from copy import deepcopy as dc
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-
-
-
-os.chdir("C:/courses/transportation&logistic management/assignment 2/Scenarios-2")
-problem = vessel_allocation_problem.from_file("scenario01.txt")  # change dataset here
-
-# # problem 0a 
-# problem = fcfs(problem)
-# problem.print_solution()
-
-
-# problem 0b
-problem = alloc_by_time_window_size(problem)
-problem.print_solution()
-pr = dc(problem)  # generally we use this to construct an initial solution because it has some randomness
-
-
-# # problem 1
-# # local_search
-# problem1 = local_search(problem, 30000) 
-# problem1.print_solution()
-
-# sa_sol = simulated_annealing(problem, max_iters=30000)
-
-# # tabu search
-# problem2 = tabu_search(problem, 500)
-# problem2.print_solution()
-
-# # problem 2
-# front = pareto_local_search(problem, 100)
-
-#problem 4
-from sim_heuristic import simulation_cost
-max_iteration = 50000  # iteration time for each algorithm
-# generate some solutions by different method
-local_search_sol = local_search(problem, max_iteration)
-tabu_search_sol = tabu_search(problem, max_iteration)
-sa_sol = simulated_annealing(problem, max_iters=max_iteration)
-solutions = [local_search_sol, tabu_search_sol, sa_sol]
-# start simulation of the solutions
-num_simu = 100
-simu_result = []  # a list of the simulation result, dim: num_solutions x num_simulations
-print("...simulation...")
-for s in solutions:
-    solution_cost = []
-    for _ in range(num_simu):
-        cost = simulation_cost(s)
-        solution_cost.append(cost)  # add the simulation result to the list
-    simu_result.append(solution_cost)  # add the results for the solution to the list
-
-fig = plt.figure(figsize =(10, 8)) 
-# Creating axes instance
-ax = fig.add_axes([0, 0, 1, 1])
-# plt.plot([1, 2, 3, 4], [100, 120, 120, 104]) 
-# Creating plot
-bp = ax.boxplot(simu_result)
-# x-axis labels
-ax.set_xticklabels(['local search', 'tabu search','simulated annealing']) 
-# plot the line that connects average values
-average = [np.mean(x) for x in simu_result]
-x_axis = [i for i in range(1, len(simu_result) + 1)]
-plt.plot(x_axis, average)
-plt.title("risk analysis of solutions")
-# show plot
-plt.show()
-
-
-        
-        
-    
-    
-
-
-
+from vessel_allocation_problem import vessel_allocation_problem
+from multi_start import run_once, CONSTRUCTIONS
+from sim_heuristic import simulation_costs
+
+SOLVERS = ["local_search", "tabu_search", "simulated_annealing", "steepest_descent",
+           "best_admissible_tabu_search", "adaptive_large_neighborhood_search"]
+ITERATION_ARG = {"local_search": "max_iter",
+                 "tabu_search": "max_iter",
+                 "steepest_descent": "max_iter",
+                 "best_admissible_tabu_search": "max_iter",
+                 "adaptive_large_neighborhood_search": "max_iter",
+                 "simulated_annealing": "max_iters"}  # name of the iteration argument of each solver
+COLUMNS = ["scenario", "solver", "seed", "initial_cost", "cost", "complete_time", "time",
+           "simulated_cost_mean", "simulated_cost_std"]
+
+def solve_file(filename, solver, seed, solver_kwargs, num_simu, cache_dir=None,
+               initial="time_window_size"):
+    """
+    load one scenario, solve it and collect its row of the results table
+
+    Parameters
+    ----------
+    filename : TYPE string
+        DESCRIPTION. the scenario file
+    solver : TYPE string
+        DESCRIPTION. name of the solver in solving_functions
+    seed : TYPE int
+        DESCRIPTION. seed of the random number generator
+    solver_kwargs : TYPE dict
+        DESCRIPTION. arguments of the solver besides the problem
+    num_simu : TYPE int
+        DESCRIPTION. number of simulated scenarios for the risk analysis, 0 for none
+    cache_dir : TYPE string, optional
+        DESCRIPTION. directory of the parsed scenario cache, see load_instance
+    initial : TYPE string, optional
+        DESCRIPTION. the construction heuristic of the initial solution
+
+    Returns
+    -------
+    row : TYPE dict
+    """
+    problem = vessel_allocation_problem.from_file(filename, cache_dir)
+    solution, row = run_once(problem, solver, seed, 0, solver_kwargs, initial)
+    row["scenario"] = os.path.basename(filename)
+    row["solver"] = solver
+    if num_simu > 0:
+        costs = simulation_costs(solution, num_simu, np.random.default_rng(seed))
+        row["simulated_cost_mean"] = float(np.mean(costs))
+        row["simulated_cost_std"] = float(np.std(costs))
+    return row
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="solve vessel allocation scenarios in parallel")
+    parser.add_argument("scenarios", nargs="+",
+                        help="scenario files or glob patterns, e.g. 'scenario*.txt'")
+    parser.add_argument("--solver", choices=SOLVERS, default="tabu_search")
+    parser.add_argument("--initial", choices=list(CONSTRUCTIONS), default="time_window_size",
+                        help="construction heuristic of the initial solution")
+    parser.add_argument("--iterations", type=int, default=50000,
+                        help="iteration budget of the solver")
+    parser.add_argument("--time-limit", type=float, default=None,
+                        help="wall-clock budget of the solver per scenario, in seconds")
+    parser.add_argument("--stagnation", type=int, default=None,
+                        help="stop after this many iterations without improvement")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of processes, the number of CPUs by default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--simulations", type=int, default=0,
+                        help="number of stochastic scenarios to simulate per solution")
+    parser.add_argument("--cache-dir", default=None,
+                        help="directory for a binary cache of the parsed scenarios")
+    parser.add_argument("--output", default="results.csv", help="path of the results table (csv)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = sorted({f for pattern in args.scenarios for f in glob.glob(pattern)})
+    if not files:
+        raise SystemExit(f"no scenario file matches {args.scenarios}")
+    solver_kwargs = {ITERATION_ARG[args.solver]: args.iterations,
+                     "time_limit": args.time_limit,
+                     "stagnation": args.stagnation}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(solve_file, f, args.solver, args.seed, solver_kwargs,
+                              args.simulations, args.cache_dir, args.initial)
+                   for f in files]
+        rows = []
+        for f, future in zip(files, futures):
+            try:
+                row = future.result()
+            except Exception as e:  # one broken scenario should not stop the whole batch
+                print(f"{f} failed: {e!r}")
+                continue
+            print(f"{row['scenario']}\tcost {row['cost']:.2f}\ttime {row['time']:.1f}s")
+            rows.append(row)
+    with open(args.output, "w", newline="") as out:
+        writer = csv.DictWriter(out, fieldnames=COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"results of {len(rows)} scenarios written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:16:52 2026
+
+@author: kaiyu.wei
+"""
+import numpy as np
+import time
+from concurrent.futures import ProcessPoolExecutor
+import solving_functions
+from solving_functions import alloc_by_time_window_size, greedy_construction
+from fitness_functions import total_cost, complete_time
+from solution_state import solution_state
+from shared_instance import shared_instance, attach_instance
+
+CONSTRUCTIONS = {"time_window_size": alloc_by_time_window_size,  # random berth order
+                 "greedy": lambda problem, rng : greedy_construction(problem)}  # deterministic
+
+def run_once(problem, solver, seed, run, solver_kwargs, initial="time_window_size"):
+    """
+    one restart: build an initial solution and improve it with the solver
+
+    Parameters
+    ----------
+    problem : TYPE vessel_allocation_problem object
+        DESCRIPTION. the problem without allocation
+    solver : TYPE function or string
+        DESCRIPTION. a solver of solving_functions, or its name
+    seed : TYPE int
+        DESCRIPTION. the seed shared by all restarts
+    run : TYPE int
+        DESCRIPTION. number of the restart, restart i gets the i-th independent stream 
+            spawned from the seed
+    solver_kwargs : TYPE dict
+        DESCRIPTION. arguments of the solver besides the problem
+    initial : TYPE string, optional
+        DESCRIPTION. the construction heuristic of the initial solution, see CONSTRUCTIONS
+
+    Returns
+    -------
+    solution : TYPE vessel_allocation_problem object
+    stats : TYPE dict
+        DESCRIPTION. seed, run, initial and final cost, complete time and run time of the restart
+    """
+    if isinstance(solver, str):
+        solver = getattr(solving_functions, solver)
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(run,)))
+    t0 = time.perf_counter()
+    initial = CONSTRUCTIONS[initial](problem, rng)
+    solution = solver(initial, rng=rng, **solver_kwargs)
+    stats = {"seed": seed,
+             "run": run,
+             "initial_cost": total_cost(initial),
+             "cost": total_cost(solution),
+             "complete_time": int(complete_time(solution)),
+             "time": time.perf_counter() - t0}
+    return solution, stats
+
+def run_shared(handle, solver, seed, run, solver_kwargs, initial="time_window_size"):
+    """
+    one restart in a worker process, on the instance data of a shared_instance.
+    Same as run_once, but the solution is returned as the output of
+    solution_state.allocation(), so only the berth sequences and start times are sent back.
+    """
+    if isinstance(solver, str):
+        solver = getattr(solving_functions, solver)
+    instance, problem = attach_instance(handle)
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(run,)))
+    t0 = time.perf_counter()
+    initial = solution_state.from_problem(CONSTRUCTIONS[initial](problem, rng), instance)
+    solution = solver(initial, rng=rng, **solver_kwargs)
+    stats = {"seed": seed,
+             "run": run,
+             "initial_cost": total_cost(initial),
+             "cost": total_cost(solution),
+             "complete_time": int(complete_time(solution)),
+             "time": time.perf_counter() - t0}
+    return solution.allocation(), stats
+
+def multi_start(problem, solver, num_runs, max_workers=None, seed=0, initial="time_window_size",
+                **solver_kwargs):
+    """
+    run independent restarts of a solver over a process pool, each restart with its own
+    seed and its own initial solution (see CONSTRUCTIONS). The workers read the
+    problem data from shared memory (see shared_instance) and send back only their solutions.
+    On Windows the caller has to be protected by if __name__ == "__main__".
+
+    Parameters
+    ----------
+    problem : TYPE vessel_allocation_problem object
+        DESCRIPTION. the problem, it is not modified. Its frozen vessels keep their
+            allocation in all restarts (see problem.freeze), the others are allocated anew
+    solver : TYPE function or string
+        DESCRIPTION. local_search, tabu_search or simulated_annealing (or their names)
+    num_runs : TYPE int
+        DESCRIPTION. number of restarts
+    max_workers : TYPE int, optional
+        DESCRIPTION. number of processes, the number of CPUs if None
+    seed : TYPE int, optional
+        DESCRIPTION. the restarts get independent random streams spawned from this seed,
+            so the same seed gives the same results
+    initial : TYPE string, optional
+        DESCRIPTION. the construction heuristic of the initial solutions, see CONSTRUCTIONS
+    **solver_kwargs :
+        DESCRIPTION. passed to the solver, e.g. max_iter=50000
+
+    Returns
+    -------
+    best : TYPE vessel_allocation_problem object
+        DESCRIPTION. the solution with the lowest total cost among all restarts
+    stats : TYPE list of dict
+        DESCRIPTION. the statistics of every restart, see run_once
+    """
+    with shared_instance(problem) as shared, ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run_shared, shared.handle, solver, seed, i, solver_kwargs, initial)
+                   for i in range(num_runs)]
+        results = [f.result() for f in futures]
+    best = min(results, key=lambda r : r[1]["cost"])[0]
+    best = solution_state.from_allocation(shared.instance, *best).to_problem(problem)
+    return best, [s for _, s in results]
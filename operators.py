@@ -5,99 +5,407 @@ Created on Sun Apr  3 14:59:23 2022
 @author: kaiyu.wei
 """
 import numpy as np
-import copy
+from solution_state import move, FORBIDDEN
 
-def swap_between_berths(problem):
+def reallocate_randomly(state, squeezed_out, rng):
+    """
+    randomly assign the squeezed out vessels to any berths in the state
+
+    Parameters
+    ----------
+    state : TYPE solution_state object
+    squeezed_out : TYPE list of int
+        DESCRIPTION. indices of the vessels that are not allocated
+    rng : TYPE numpy.random.Generator
+
+    Returns
+    -------
+    TYPE bool
+        DESCRIPTION. True if all the vessels are allocated again, False otherwise
+    """
+    for v in squeezed_out:
+        try_count = 1
+        while (try_count <= 10 and state.berth_of[v] == -1):  # try at most 10 times for each vessel
+            b = rng.integers(state.nr_berth)  # randomly select a berth
+            index, start_time = state.first_feasible_position(v, b)
+            if index != -1:
+                state.insert_vessel(v, b, index)
+            try_count += 1
+        if state.berth_of[v] == -1:
+            return False
+    return True
+
+def swap_between_berths(state, rng=None):
     """
     randomly swap two vessels from two berths
 
+    Parameters
+    ----------
+    state : TYPE solution_state object
+        DESCRIPTION. the current solution, it is not modified
+    rng : TYPE numpy.random.Generator or int, optional
+        DESCRIPTION. the random number generator, or a seed for a new one
+
+    Returns
+    -------
+    TYPE move object
+        DESCRIPTION. the proposed move, use state.commit to get the neighbor. move.delta is
+            the cost change, it only comes from the recalculated berth suffixes. If no 
+            neighbor is found, the move has no change
     """
-    orig = copy.deepcopy(problem)  # store the old problem   
-    swap_count = 1  # the time for which we want to try to swap if it fails 
+    rng = np.random.default_rng(rng)
+    swap_count = 1  # the time for which we want to try to swap if it fails
     while (swap_count <= 10):  # try swap at most 10 times
-        problem = copy.deepcopy(orig)
-        selc_berths = np.random.choice(problem.berths, size=2, replace=False)  # select 2 berths
-        if (selc_berths[0].vessels and selc_berths[1].vessels):
-            selc_v0 = np.random.choice(selc_berths[0].vessels) 
-            selc_v1 = np.random.choice(selc_berths[1].vessels)
-            sq0, sq1 = problem.swap_between_berths(selc_v0, selc_v1)
-            swap_count += 1  # try at most 10 times
-            if (not sq0 and not sq1):
-                return problem  # return the swapped vessels           
-            else:  # if there are squeezed out vessels, randomly assign them to any berths in the problem
-                if sq0:
-                    for v in sq0:                       
-                        try_count = 1
-                        while (try_count <= 10 and not v.is_allocated):
-                            b = np.random.choice(problem.berths)  # randomly select a berth
-                            index, start_time = b.first_feasible_start_time(v)
-                            if index != -1:
-                                b.insert_vessel(v, index)
-                            try_count += 1
-                    # check if all vessels in the squeezed out list have been allocated
-                    all_allocated0 = True
-                    for v in sq0:
-                        if not v.is_allocated:
-                            all_allocated0 = False
-                            break
-                if sq1:
-                    for v in sq1:
-                        try_count = 1
-                        while (try_count <= 10 and not v.is_allocated):
-                            b = np.random.choice(problem.berths)  # randomly select a berth
-                            index, start_time = b.first_feasible_start_time(v)
-                            if index != -1:
-                                b.insert_vessel(v, index)
-                            try_count += 1
-                    # check if all vessels in the squeezed out list have been allocated
-                    all_allocated1 = True
-                    for v in sq1:
-                        if not v.is_allocated:
-                            all_allocated1 = False
-                            break                   
-    if (all_allocated0 and all_allocated1):
-        # if all vessels are allocated, return the new solution
-        return problem                        
-    else:                  
-        return orig  # if swap fails, return the original problem
-            
-def move_in_berth(problem):   
+        swap_count += 1
+        b0, b1 = rng.choice(state.nr_berth, size=2, replace=False)  # select 2 berths
+        seq0, seq1 = state.sequences[b0], state.sequences[b1]
+        f0, f1 = state.frozen[b0], state.frozen[b1]  # only the vessels behind them can move
+        if (len(seq0) > f0 and len(seq1) > f1):
+            selc_v0 = seq0[f0 + rng.integers(len(seq0) - f0)]
+            selc_v1 = seq1[f1 + rng.integers(len(seq1) - f1)]
+            proposal = state.propose_swap(selc_v0, selc_v1)
+            if proposal.feasible:
+                return proposal  # the swap is evaluated without changing the state
+            # if there are squeezed out vessels, apply the swap on a copy and 
+            # randomly assign them to any berths
+            neighbor = state.copy()
+            sqz = neighbor.swap_between_berths(selc_v0, selc_v1)
+            if reallocate_randomly(neighbor, sqz, rng):
+                return move(True, None, delta=neighbor.running_cost - state.running_cost,
+                            neighbor=neighbor)
+    return move(True, [])  # if swap fails, propose no change
+
+def move_in_berth(state, rng=None):
     """
     randomly move one vessel within its own berth
 
+    Parameters
+    ----------
+    state : TYPE solution_state object
+        DESCRIPTION. the current solution, it is not modified
+    rng : TYPE numpy.random.Generator or int, optional
+        DESCRIPTION. the random number generator, or a seed for a new one
+
+    Returns
+    -------
+    TYPE move object
+        DESCRIPTION. the proposed move, use state.commit to get the neighbor. move.delta is
+            the cost change, it only comes from the recalculated berth suffixes. If no 
+            neighbor is found, the move has no change
     """
-    orig = copy.deepcopy(problem)
+    rng = np.random.default_rng(rng)
     try_count = 1
     while (try_count <= 10):  # try move at most 10 times
-        sqz = []
-        problem = copy.deepcopy(orig)
-        selc_berth = np.random.choice(problem.berths)  # randomly choose a berth
-        if (len(selc_berth.vessels) >= 2):  # if the list has at least 2 vessels
-            selc_vessels = np.random.choice(selc_berth.vessels, 
-                                          size=2, replace=False)  # randomly choose 2 vessels in the list
-            # try to move the second one before the first
-            selc_berth.remove_vessel(selc_vessels[1])  # first remove the selected vessel that is going to be inserted
-            before_ind = selc_berth.vessel_index(selc_vessels[0].id)  # get the insertion index
-            sqz = selc_berth.insert_vessel(selc_vessels[1], before_ind)
         try_count += 1
-        if (not sqz):  # if sqz is empty, so that the insertion has succeeded
-            return problem  # terminate the function, otherwise go back the the while loop
-        else:  # if there are squeezed out vessels, randomly assign them to any berths in the problem
-            for v in sqz:                       
-                try_count = 1
-                while (try_count <= 10 and not v.is_allocated):  # try to randomly alocated the vessel, at most 10 times
-                    b = np.random.choice(problem.berths)  # randomly select a berth
-                    index, start_time = b.first_feasible_start_time(v)
-                    if index != -1:
-                        b.insert_vessel(v, index)
-                    try_count += 1
-            # check if all vessels in the squeezed out list have been allocated
-            all_allocated = True
-            for v in sqz:
-                if not v.is_allocated:  
-                    all_allocated = False  # if any vessel is not allocated
-                    break
-    if all_allocated:  # if all vessels are allocated
-        return problem  # return the new solution (the neighbor)
+        selc_berth = rng.integers(state.nr_berth)  # randomly choose a berth
+        seq = state.sequences[selc_berth]
+        f = state.frozen[selc_berth]  # the vessels in front of the index cannot move
+        if (len(seq) - f >= 2):  # if the list has at least 2 movable vessels
+            ind = f + rng.choice(len(seq) - f, size=2, replace=False)  # randomly choose 2 vessels in the list
+            # try to move the second one before the first
+            proposal = state.propose_move_in_berth(seq[ind[1]], seq[ind[0]])
+            if proposal.feasible:
+                return proposal
+            # if there are squeezed out vessels, apply the move on a copy and 
+            # randomly assign them to any berths
+            neighbor = state.copy()
+            sqz = neighbor.move_in_berth(seq[ind[1]], seq[ind[0]])
+            if reallocate_randomly(neighbor, sqz, rng):
+                return move(True, None, delta=neighbor.running_cost - state.running_cost,
+                            neighbor=neighbor)
+    return move(True, [])  # if cannot find a new neighbor, propose no change
+
+SWAP, MOVE = 0, 1  # kinds of the candidates of candidate_moves
+
+def candidate_moves(state, max_candidates=None, rng=None):
+    """
+    score a whole batch of neighbors of the state at once: the swaps of two vessels between
+    two berths and the moves of a vessel in front of another one of its berth. The new
+    schedules of all changed berth suffixes are calculated together with numpy, one
+    position of the suffixes at a time. Only the neighbors in which no vessel is squeezed
+    out are returned, and only the vessels behind the frozen part of the berths are moved.
+
+    Parameters
+    ----------
+    state : TYPE solution_state object
+    max_candidates : TYPE int, optional
+        DESCRIPTION. if given, at most this many random candidates of each kind are scored,
+            otherwise all of them
+    rng : TYPE numpy.random.Generator or int, optional
+        DESCRIPTION. the random number generator for the sampling, or a seed for a new one
+
+    Returns
+    -------
+    kind : TYPE array of int
+        DESCRIPTION. SWAP or MOVE for every feasible candidate
+    a, b : TYPE array of int
+        DESCRIPTION. the two vessels of every candidate, see propose_candidate
+    delta : TYPE array of float
+        DESCRIPTION. the cost change of every candidate, the arrays are sorted by it
+    """
+    rng = np.random.default_rng(rng)
+    seq = _sequence_matrix(state)
+    nr_berth, width = seq.shape
+    berth_of = np.frombuffer(state.berth_of, dtype=np.int64)
+    position = np.full(state.nr_vessel, -1, dtype=np.int64)  # position of the vessels in their berth
+    for j in range(nr_berth):
+        position[seq[j][seq[j] >= 0]] = np.arange(np.count_nonzero(seq[j] >= 0))
+
+    # swaps: vessel v0 takes the place of v1 and the other way round
+    allocated = state.movable()
+    if max_candidates is None or len(allocated) == 0:
+        p, q = np.triu_indices(len(allocated), 1)
     else:
-        return orig  # if cannot find a new neighbor, return the original solution
+        p, q = rng.integers(len(allocated), size=(2, max_candidates))
+    v0, v1 = allocated[p], allocated[q]
+    keep = berth_of[v0] != berth_of[v1]
+    v0, v1 = v0[keep], v1[keep]
+    # tails[j, i] is the part of berth j behind position i
+    cols = np.arange(width)[None, :] + np.arange(1, width + 1)[:, None]
+    tails = np.where(cols < width, seq[:, np.minimum(cols, width - 1)], -1)
+    rows0 = np.column_stack([v1, tails[berth_of[v0], position[v0]]])
+    rows1 = np.column_stack([v0, tails[berth_of[v1], position[v1]]])
+    feasible0, delta0 = _evaluate_suffixes(state, seq, berth_of[v0], position[v0], rows0)
+    feasible1, delta1 = _evaluate_suffixes(state, seq, berth_of[v1], position[v1], rows1)
+    swap_ok = feasible0 & feasible1
+
+    # moves in berth: the vessel at position i is put in front of the vessel at position k
+    moved, before, berths, starts, rows = [], [], [], [], []
+    for j in range(nr_berth):
+        s = seq[j][seq[j] >= 0].tolist()
+        n = len(s)
+        f = state.frozen[j]
+        for i in range(f, n):
+            for k in range(f, n):
+                if k == i or k == i + 1:
+                    continue  # k == i + 1 leaves the sequence as it is
+                if k < i:
+                    starts.append(k)
+                    rows.append([s[i]] + s[k:i] + s[i + 1:])
+                else:
+                    starts.append(i)
+                    rows.append(s[i + 1:k] + [s[i]] + s[k:])
+                moved.append(s[i])
+                before.append(s[k])
+                berths.append(j)
+    if max_candidates is not None and len(moved) > max_candidates:
+        chosen = rng.choice(len(moved), size=max_candidates, replace=False)
+    else:
+        chosen = np.arange(len(moved))
+    move_rows = np.full((len(chosen), width), -1, dtype=np.int64)
+    for r, c in enumerate(chosen):
+        move_rows[r, :len(rows[c])] = rows[c]
+    move_ok, move_delta = _evaluate_suffixes(state, seq, np.array(berths, dtype=np.int64)[chosen],
+                                             np.array(starts, dtype=np.int64)[chosen], move_rows)
+
+    kind = np.concatenate([np.full(np.count_nonzero(swap_ok), SWAP),
+                           np.full(np.count_nonzero(move_ok), MOVE)])
+    a = np.concatenate([v0[swap_ok], np.array(moved, dtype=np.int64)[chosen][move_ok]])
+    b = np.concatenate([v1[swap_ok], np.array(before, dtype=np.int64)[chosen][move_ok]])
+    delta = np.concatenate([(delta0 + delta1)[swap_ok], move_delta[move_ok]])
+    order = np.argsort(delta, kind="stable")
+    return kind[order], a[order], b[order], delta[order]
+
+def propose_candidate(state, kind, a, b):
+    """
+    the move object of a candidate of candidate_moves, for state.commit
+    """
+    if kind == SWAP:
+        return state.propose_swap(int(a), int(b))
+    return state.propose_move_in_berth(int(a), int(b))
+
+def _sequence_matrix(state):
+    """
+    the berth sequences as a (nr of berths x longest sequence) matrix, padded with -1
+    """
+    width = max(max((len(s) for s in state.sequences), default=0), 1)
+    seq = np.full((state.nr_berth, width), -1, dtype=np.int64)
+    for j, s in enumerate(state.sequences):
+        seq[j, :len(s)] = np.frombuffer(s, dtype=np.int64)
+    return seq
+
+def _evaluate_suffixes(state, seq, berth, index, rows):
+    """
+    the vectorized version of solution_state.propose_suffix: row r of rows is the new
+    sequence of berth[r] from index[r] on, padded with -1
+
+    Returns
+    -------
+    feasible : TYPE array of bool
+    delta : TYPE array of float
+        DESCRIPTION. the cost change of every suffix, meaningless if not feasible
+    """
+    inst = state.instance
+    leave = np.frombuffer(state.leave, dtype=np.int64)
+    before = seq[berth, np.maximum(index - 1, 0)]
+    # the index is never in the frozen part, see solution_state._pre_leaving
+    pre_leaving = np.where(index > np.array(state.frozen)[berth], leave[before],
+                           np.array(state.release)[berth])
+    close = inst.berth_close[berth]
+    feasible = np.ones(len(rows), dtype=bool)
+    delta = np.zeros(len(rows))
+    for t in range(rows.shape[1]):
+        v = rows[:, t]
+        active = v >= 0
+        if not active.any():
+            break
+        v = np.where(active, v, 0)
+        handling = inst.handling[v, berth]
+        leaving = np.maximum(pre_leaving, inst.arrival[v]) + handling
+        feasible &= ~active | ((handling != FORBIDDEN) & (leaving <= inst.leaving[v])
+                               & (leaving <= close))
+        old_leaving = np.where(leave[v] >= 0, leave[v], inst.arrival[v])
+        delta += np.where(active, (leaving - old_leaving) * inst.cost[v], 0.0)
+        pre_leaving = np.where(active, leaving, pre_leaving)
+    return feasible, delta
+
+def random_removal(state, q, rng):
+    """
+    destroy operator of the large neighborhood search: q random vessels.
+    The destroy operators only choose the vessels, the state is not changed, and they only
+    choose movable vessels (see solution_state.movable).
+
+    Returns
+    -------
+    TYPE list of int
+        DESCRIPTION. indices of the vessels to remove
+    """
+    movable = state.movable()
+    return rng.choice(movable, size=min(q, len(movable)), replace=False).tolist()
+
+def worst_removal(state, q, rng):
+    """
+    destroy operator: the q vessels with the highest waiting cost (start - arrival) x cost,
+    with some noise so that repeated calls do not always pick the same vessels
+    """
+    inst = state.instance
+    movable = state.movable()
+    start = np.frombuffer(state.start, dtype=np.int64)[movable]
+    waiting = (start - inst.arrival[movable]) * inst.cost[movable]
+    score = waiting * rng.uniform(0.8, 1.2, size=len(movable))
+    return movable[np.argsort(-score, kind="stable")[:q]].tolist()
+
+def related_removal(state, q, rng):
+    """
+    destroy operator: a random vessel and the q - 1 vessels with the most similar time
+    windows, measured by the distance of the arrival and leaving times
+    """
+    inst = state.instance
+    movable = state.movable()
+    seed = movable[rng.integers(len(movable))]
+    distance = (np.abs(inst.arrival[movable] - inst.arrival[seed])
+                + np.abs(inst.leaving[movable] - inst.leaving[seed])
+                + rng.random(len(movable)))  # random tie-break
+    return movable[np.argsort(distance, kind="stable")[:q]].tolist()
+
+def time_window_removal(state, q, rng):
+    """
+    destroy operator: the q vessels in operation closest to a random time, over all berths,
+    so that a time window of the whole port is re-planned
+    """
+    movable = state.movable()
+    start = np.frombuffer(state.start, dtype=np.int64)[movable]
+    leave = np.frombuffer(state.leave, dtype=np.int64)[movable]
+    t = rng.integers(start.min(), leave.max() + 1)
+    distance = np.maximum(np.maximum(start - t, t - leave), 0) + rng.random(len(movable))
+    return movable[np.argsort(distance, kind="stable")[:q]].tolist()
+
+def insertion_costs(state, vessels, berths=None):
+    """
+    score the insertion of unallocated vessels in every position of every berth at once,
+    with the same vectorized suffix recurrence as candidate_moves
+
+    Parameters
+    ----------
+    state : TYPE solution_state object
+    vessels : TYPE list of int
+        DESCRIPTION. indices of unallocated vessels
+    berths : TYPE list of int, optional
+        DESCRIPTION. indices of the berths to score, all berths if None
+
+    Returns
+    -------
+    best_delta : TYPE 2d array of float, shape = (nr of vessels, nr of scored berths)
+        DESCRIPTION. the lowest cost change of inserting each vessel in each berth,
+            inf if the vessel does not fit anywhere in the berth without squeezing out a vessel
+    best_index : TYPE 2d array of int, same shape
+        DESCRIPTION. the position of that insertion, -1 if there is none
+    """
+    seq = _sequence_matrix(state)
+    width = seq.shape[1]
+    berths = np.arange(state.nr_berth) if berths is None else np.asarray(berths, dtype=np.int64)
+    nr_berth = len(berths)
+    frozen = np.array(state.frozen, dtype=np.int64)[berths]
+    lengths = np.count_nonzero(seq[berths] >= 0, axis=1) - frozen  # positions behind the frozen part
+    berth = np.repeat(berths, lengths + 1)  # every (berth, position) pair
+    index = np.concatenate([np.arange(f, f + n + 1) for f, n in zip(frozen, lengths)])
+    cols = index[:, None] + np.arange(width)[None, :]
+    tails = np.where(cols < width, seq[berth[:, None], np.minimum(cols, width - 1)], -1)
+    n, slots = len(vessels), len(berth)
+    rows = np.empty((n * slots, width + 1), dtype=np.int64)
+    rows[:, 0] = np.repeat(vessels, slots)
+    rows[:, 1:] = np.tile(tails, (n, 1))
+    feasible, delta = _evaluate_suffixes(state, seq, np.tile(berth, n), np.tile(index, n), rows)
+    delta = np.where(feasible, delta, np.inf).reshape(n, slots)
+    best_delta = np.full((n, nr_berth), np.inf)
+    best_index = np.full((n, nr_berth), -1, dtype=np.int64)
+    first = 0
+    for j in range(nr_berth):
+        block = delta[:, first:first + lengths[j] + 1]
+        k = np.argmin(block, axis=1)
+        best_delta[:, j] = block[np.arange(n), k]
+        best_index[:, j] = np.where(np.isfinite(best_delta[:, j]), frozen[j] + k, -1)
+        first += lengths[j] + 1
+    return best_delta, best_index
+
+def regret_insertion(state, vessels, rng=None, k=2):
+    """
+    repair operator of the large neighborhood search: insert the vessels one by one into the
+    state, each time the vessel with the highest regret, i.e. the sum of the cost differences
+    between its best berth and its next k - 1 best berths, at its cheapest position.
+    Vessels with fewer possible berths have a higher regret. With k = 1 this is the greedy
+    insertion: always the cheapest insertion of all vessels.
+
+    Parameters
+    ----------
+    state : TYPE solution_state object
+        DESCRIPTION. the state is changed
+    vessels : TYPE list of int
+        DESCRIPTION. indices of the unallocated vessels
+    rng : TYPE numpy.random.Generator, optional
+        DESCRIPTION. not used, for the common signature of the repair operators
+    k : TYPE int, optional
+
+    Returns
+    -------
+    TYPE bool
+        DESCRIPTION. False if a vessel cannot be inserted anywhere, the state is then incomplete
+    """
+    vessels = list(vessels)
+    best_delta, best_index = insertion_costs(state, vessels)
+    while vessels:
+        ranked = np.sort(best_delta, axis=1)
+        if not np.isfinite(ranked[:, 0]).all():
+            return False
+        if k > 1:
+            # an impossible berth counts as a very expensive one
+            regret = np.sum(np.minimum(ranked[:, 1:k], 1e12) - ranked[:, :1], axis=1)
+            pick = np.lexsort((ranked[:, 0], -regret))[0]
+        else:
+            pick = np.argmin(ranked[:, 0])
+        berth = int(np.argmin(best_delta[pick]))
+        if state.insert_vessel(vessels[pick], berth, int(best_index[pick, berth])):
+            return False  # cannot happen, the insertion was checked
+        del vessels[pick]
+        best_delta = np.delete(best_delta, pick, axis=0)
+        best_index = np.delete(best_index, pick, axis=0)
+        if vessels:  # only the insertions in the changed berth have to be scored again
+            best_delta[:, berth:berth + 1], best_index[:, berth:berth + 1] = insertion_costs(
+                state, vessels, [berth])
+    return True
+
+def greedy_insertion(state, vessels, rng=None):
+    """
+    repair operator: always the cheapest insertion of all vessels, see regret_insertion
+    """
+    return regret_insertion(state, vessels, rng, k=1)
@@ -4,6 +4,7 @@ Created on Fri Apr  8 10:41:17 2022
 
 @author: kaiyu.wei
 """
+from bisect import bisect_left, bisect_right
 from fitness_functions import total_cost, complete_time
 
 def not_dominated(solu1, solu2):
@@ -32,4 +33,88 @@ def not_dominated(solu1, solu2):
         return False
     
 
-    
\ No newline at end of file
+    
+class pareto_archive:
+    def __init__(self, max_size=None):
+        """
+        the Pareto front of pareto_local_search, for minimizing total cost and complete time.
+        Every member is stored with its objective vector, so the objectives are calculated
+        only once per solution. The members are kept sorted by cost; in a front the complete
+        time then decreases with the cost, so the dominance check of a new solution and the
+        search for the members it dominates are both bisections.
+
+        Parameters
+        ----------
+        max_size : TYPE int, optional
+            DESCRIPTION. max number of members, the most crowded member (smallest crowding
+                distance) is dropped when the front grows larger. Unbounded if None
+        """
+        self.max_size = max_size
+        self.members = []  # solutions, sorted by cost
+        self.costs = []  # ascending
+        self.neg_times = []  # -complete time of the members, ascending as well
+
+    def __len__(self):
+        return len(self.members)
+
+    def __getitem__(self, ind):
+        return self.members[ind]
+
+    def __iter__(self):
+        return iter(self.members)
+
+    def dominated(self, cost, time):
+        """
+        True if a member is at least as good as (cost, time) in both objectives
+        """
+        k = bisect_right(self.costs, cost)
+        # member k - 1 has the shortest complete time among the members with cost <= cost
+        return k > 0 and -self.neg_times[k - 1] <= time
+
+    def add(self, solution, cost, time):
+        """
+        add a solution to the front unless it is dominated, and drop the members it dominates
+
+        Parameters
+        ----------
+        solution : TYPE solution object
+        cost : TYPE float
+            DESCRIPTION. total cost of the solution
+        time : TYPE int
+            DESCRIPTION. complete time of the solution
+
+        Returns
+        -------
+        added : TYPE bool
+            DESCRIPTION. False if the solution is dominated by a member
+        removed : TYPE list of solution objects
+            DESCRIPTION. the members that are dropped from the front
+        """
+        if self.dominated(cost, time):
+            return False, []
+        # the dominated members have cost >= cost and time >= time, a block of the list
+        lo = bisect_left(self.costs, cost)
+        hi = max(bisect_right(self.neg_times, -time), lo)
+        removed = self.members[lo:hi]
+        self.members[lo:hi] = [solution]
+        self.costs[lo:hi] = [cost]
+        self.neg_times[lo:hi] = [-time]
+        if self.max_size is not None and len(self.members) > self.max_size:
+            ind = self.most_crowded()
+            removed.append(self.members.pop(ind))
+            del self.costs[ind], self.neg_times[ind]
+        return True, removed
+
+    def most_crowded(self):
+        """
+        the index of the member with the smallest crowding distance, the two ends of the
+        front are never chosen
+        """
+        n = len(self.members)
+        if n <= 2:
+            return n - 1
+        cost_range = (self.costs[-1] - self.costs[0]) or 1
+        time_range = (self.neg_times[-1] - self.neg_times[0]) or 1
+        return min(range(1, n - 1),
+                   key=lambda i : ((self.costs[i + 1] - self.costs[i - 1]) / cost_range
+                                   + (self.neg_times[i + 1] - self.neg_times[i - 1]) / time_range))
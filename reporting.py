@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:41:09 2026
+
+@author: kaiyu.wei
+"""
+import numpy as np
+
+class convergence_trace:
+    def __init__(self, every=1):
+        """
+        callback for the solvers in solving_functions that keeps the fitness of every
+        "every"-th iteration
+
+        Parameters
+        ----------
+        every : TYPE int, optional
+            DESCRIPTION. sampling interval in iterations, 1 keeps all of them
+        """
+        self.every = every
+        self.iterations = []
+        self.values = []
+
+    def __call__(self, iteration, value):
+        if iteration % self.every == 0:
+            self.iterations.append(iteration)
+            self.values.append(value)
+
+def plot_convergence(trace, title):
+    """
+    plot the fitness recorded by a convergence_trace
+
+    """
+    import matplotlib.pyplot as plt  # only imported when something is plotted
+    plt.plot(trace.iterations, trace.values)
+    plt.title(title)
+    plt.show()
+
+def plot_risk_analysis(simu_result, labels):
+    """
+    box plot of the simulated costs of several solutions, with a line through the averages
+
+    Parameters
+    ----------
+    simu_result : TYPE list of array of float
+        DESCRIPTION. the simulated costs of each solution
+    labels : TYPE list of string
+        DESCRIPTION. name of each solution
+    """
+    import matplotlib.pyplot as plt  # only imported when something is plotted
+    fig = plt.figure(figsize =(10, 8)) 
+    # Creating axes instance
+    ax = fig.add_axes([0, 0, 1, 1])
+    # Creating plot
+    ax.boxplot(simu_result)
+    # x-axis labels
+    ax.set_xticklabels(labels) 
+    # plot the line that connects average values
+    average = [np.mean(x) for x in simu_result]
+    x_axis = [i for i in range(1, len(simu_result) + 1)]
+    plt.plot(x_axis, average)
+    plt.title("risk analysis of solutions")
+    # show plot
+    plt.show()
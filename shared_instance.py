@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:20:45 2026
+
+@author: kaiyu.wei
+"""
+import numpy as np
+from multiprocessing import shared_memory
+from solution_state import instance_data
+from vessel_allocation_problem import vessel_allocation_problem, vessel, berth
+
+FIELDS = ["arrival", "leaving", "handling", "cost", "berth_start", "berth_close"]  # of instance_data
+
+_attached = {}  # shared memory name -> (SharedMemory, instance_data, problem) in this process
+
+class shared_instance:
+    def __init__(self, problem):
+        """
+        the static data of a problem in one block of shared memory, for the worker processes
+        of a process pool. The workers get only the handle, a small tuple, and attach to the
+        block with attach_instance instead of receiving a pickled copy of the problem.
+        The block is released by close(), or at the end of a with statement.
+
+        Parameters
+        ----------
+        problem : TYPE vessel_allocation_problem object
+            DESCRIPTION. the problem, vessels and berths are indexed by their position in
+                problem.vessels and problem.berths as in instance_data. Only the allocation
+                of its frozen vessels is shared, with the pins and the freeze time
+                (see problem.freeze)
+        """
+        self.instance = instance_data.from_problem(problem)
+        arrays = {name: getattr(self.instance, name) for name in FIELDS}
+        # the file row of every vessel and berth, to rebuild the same ids in the workers
+        arrays["vessel_index"] = np.array([v.index for v in problem.vessels], dtype=np.int64)
+        arrays["berth_index"] = np.array([b.index for b in problem.berths], dtype=np.int64)
+        arrays["pinned"] = self.instance.pinned.astype(np.int64)  # 8 bytes as the others
+        # berth and start time of the vessels in the frozen part of the berths, -1 for the others
+        position = {id(v): i for i, v in enumerate(problem.vessels)}
+        arrays["frozen_berth"] = np.full(len(problem.vessels), -1, dtype=np.int64)
+        arrays["frozen_start"] = np.full(len(problem.vessels), -1, dtype=np.int64)
+        for j, b in enumerate(problem.berths):
+            for v in problem.frozen_part(b)[0]:
+                arrays["frozen_berth"][position[id(v)]] = j
+                arrays["frozen_start"][position[id(v)]] = v.operation_start
+        layout = []  # (name, dtype, shape, offset in the block) of every array
+        size = 0
+        for name, a in arrays.items():
+            layout.append((name, a.dtype.str, a.shape, size))
+            size += a.nbytes  # all the arrays have 8 byte elements, so the offsets stay aligned
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for (name, dtype, shape, offset), a in zip(layout, arrays.values()):
+            np.ndarray(shape, dtype, self.shm.buf, offset)[...] = a
+        self.handle = (self.shm.name, layout, problem.freeze_time)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def attach_instance(handle):
+    """
+    attach to the shared memory block of a shared_instance. The numpy arrays of the returned
+    instance data are read-only views of the block, only the plain lists that instance_data
+    keeps for its scalar loops are built in the process. Every process attaches only once,
+    later calls with the same handle return the same objects.
+
+    Parameters
+    ----------
+    handle : TYPE tuple
+        DESCRIPTION. shared_instance.handle
+
+    Returns
+    -------
+    instance : TYPE instance_data object
+    problem : TYPE vessel_allocation_problem object
+        DESCRIPTION. the problem with only its frozen vessels allocated, for the construction
+            heuristics that work on problem objects. Its vessels are in the order of the
+            instance data.
+    """
+    name, layout, freeze_time = handle
+    if name not in _attached:
+        shm = shared_memory.SharedMemory(name=name)
+        arrays = {}
+        for field, dtype, shape, offset in layout:
+            arrays[field] = np.ndarray(shape, dtype, shm.buf, offset)
+            arrays[field].flags.writeable = False
+        pinned = arrays["pinned"].astype(bool)
+        instance = instance_data(*(arrays[field] for field in FIELDS), pinned, freeze_time)
+        vessels = [vessel(instance.arrival_list[i], instance.leaving_list[i],
+                          instance.handling_list[i][:], instance.cost_list[i], index)
+                   for i, index in enumerate(arrays["vessel_index"].tolist())]
+        berths = [berth(instance.start_list[j], instance.close_list[j], index)
+                  for j, index in enumerate(arrays["berth_index"].tolist())]
+        problem = vessel_allocation_problem(vessels, berths)
+        problem.freeze_time = freeze_time
+        for v, pin, j, start in zip(vessels, instance.pinned_list, arrays["frozen_berth"].tolist(),
+                                    arrays["frozen_start"].tolist()):
+            v.pinned = pin
+            if j >= 0:
+                berths[j].add_vessel(v, start)
+        _attached[name] = (shm, instance, problem)
+    return _attached[name][1:]
@@ -5,34 +5,84 @@ Created on Fri Apr 15 14:41:28 2022
 @author: kaiyu.wei
 """
 import numpy as np
+from solution_state import solution_state
 
-def simulation_cost(problem):
+def simulation_cost(problem, rng=None):
     """
-    evaluate the input solution and return the cost in a circumstance of stochastic 
+    evaluate the input solution and return the cost in a circumstance of stochastic
     arrival time and handling time.
 
     """
-    berth_cost = []  # a list of costs for each berth
-    for b in problem.berths:
-        vessel_cost = .0
-        allowed_start = b.start
-        for v in b.vessels:
-            r_arrival = np.random.randint(v.arrival + 2, v.arrival + 5)  # real arrival time
-            static_handling = v.handling_time[int(b.id[6:])]  
-            r_start = max(allowed_start, r_arrival)  # real start time for operation considering the real arrival time
-            r_handling = np.random.randint(static_handling + 1, static_handling + 7)  # real handling time
-            r_leaving = r_start + r_handling  # real leaving time
-            normal_cost = (r_leaving - r_arrival) * v.cost  # cost for handling operation
-            delay_cost = 25.0 * (r_start - v.operation_start) if r_start > v.operation_start else 0  # cost for delay
-            late_punishment = 450 if r_leaving > v.leaving else 0
-            vessel_cost += (normal_cost + delay_cost + late_punishment)  # add cost of the current vessel
-            # update the earlist start time for the next vessel
-            allowed_start = r_leaving
-        berth_cost.append(vessel_cost)  # add the cost of the berth to the cost list
-    return np.sum(berth_cost)
-            
-
-                
-            
-            
-        
+    return simulation_costs(problem, 1, rng)[0]
+
+def simulation_costs(problem, num_simu, rng=None):
+    """
+    evaluate the input solution in num_simu scenarios of stochastic arrival time and
+    handling time at once. All random numbers are drawn as (num_simu x nr of vessels) arrays,
+    and the start/leave times are propagated through the berths for all scenarios together,
+    one position of the berths' vessel lists at a time.
+
+    Parameters
+    ----------
+    problem : TYPE vessel_allocation_problem or solution_state object
+        DESCRIPTION. the solution to evaluate
+    num_simu : TYPE int
+        DESCRIPTION. number of scenarios
+    rng : TYPE numpy.random.Generator or int, optional
+        DESCRIPTION. the random number generator, or a seed for a new one
+
+    Returns
+    -------
+    TYPE array of float, length = num_simu
+        DESCRIPTION. the cost of the solution in every scenario
+    """
+    # vessel data in the order of the berths' vessel lists
+    if isinstance(problem, solution_state):
+        inst = problem.instance
+        sequences = [list(seq) for seq in problem.sequences]
+        vessels = [i for seq in sequences for i in seq]
+        arrival = inst.arrival[vessels]
+        leaving = inst.leaving[vessels]
+        cost = inst.cost[vessels]
+        op_start = np.array([problem.start[i] for i in vessels], dtype=np.int64)
+        handling = inst.handling[vessels, [problem.berth_of[i] for i in vessels]]
+        berth_start = inst.berth_start
+    else:
+        sequences = [b.vessels for b in problem.berths]
+        vessels = [v for seq in sequences for v in seq]
+        arrival = np.array([v.arrival for v in vessels], dtype=np.int64)
+        leaving = np.array([v.leaving for v in vessels], dtype=np.int64)
+        cost = np.array([v.cost for v in vessels], dtype=np.float64)
+        op_start = np.array([v.operation_start for v in vessels], dtype=np.int64)
+        handling = np.array([v.handling_time[b.index] for b in problem.berths for v in b.vessels],
+                            dtype=np.int64)
+        berth_start = np.array([b.start for b in problem.berths], dtype=np.int64)
+
+    rng = np.random.default_rng(rng)
+    r_arrival = arrival + rng.integers(2, 5, size=(num_simu, len(vessels)))  # real arrival time
+    r_handling = handling + rng.integers(1, 7, size=(num_simu, len(vessels)))  # real handling time
+
+    # position[b, k] is the column of the k-th vessel of berth b, -1 if the berth has less vessels
+    lengths = [len(seq) for seq in sequences]
+    max_len = max(lengths, default=0)
+    position = np.full((len(sequences), max_len), -1, dtype=np.int64)
+    first = 0
+    for b, n in enumerate(lengths):
+        position[b, :n] = np.arange(first, first + n)
+        first += n
+
+    allowed_start = np.broadcast_to(berth_start, (num_simu, len(sequences))).copy()
+    r_start = np.empty((num_simu, len(vessels)), dtype=np.int64)
+    for k in range(max_len):
+        busy = position[:, k] >= 0  # the berths that still have a k-th vessel
+        cols = position[busy, k]
+        # real start time for operation considering the real arrival time
+        r_start[:, cols] = np.maximum(allowed_start[:, busy], r_arrival[:, cols])
+        # update the earlist start time for the next vessel
+        allowed_start[:, busy] = r_start[:, cols] + r_handling[:, cols]
+    r_leaving = r_start + r_handling  # real leaving time
+
+    normal_cost = (r_leaving - r_arrival) * cost  # cost for handling operation
+    delay_cost = 25.0 * np.maximum(r_start - op_start, 0)  # cost for delay
+    late_punishment = 450.0 * (r_leaving > leaving)
+    return np.sum(normal_cost + delay_cost + late_punishment, axis=1)
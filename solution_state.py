@@ -0,0 +1,719 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:40 2026
+
+@author: kaiyu.wei
+"""
+import numpy as np
+import copy
+from array import array
+
+FORBIDDEN = 200  # handling time that marks a berth as forbidden for a vessel
+
+
+class instance_data:
+    def __init__(self, arrival, leaving, handling, cost, berth_start, berth_close, pinned=None,
+                 freeze_time=None):
+        """
+        static data of a problem, stored in numpy arrays. It never changes during the search,
+        so all solution states of one problem share the same instance_data object.
+
+        Parameters
+        ----------
+        arrival : TYPE array of int, length = nr of vessels
+            DESCRIPTION. arrival time of each vessel
+        leaving : TYPE array of int, length = nr of vessels
+            DESCRIPTION. leaving time (end of the time window) of each vessel
+        handling : TYPE 2d array of int, shape = (nr of vessels, nr of berths)
+            DESCRIPTION. handling time of each vessel in each berth
+        cost : TYPE array of float, length = nr of vessels
+            DESCRIPTION. cost per unit time of each vessel
+        berth_start : TYPE array of int, length = nr of berths
+            DESCRIPTION. open time of each berth
+        berth_close : TYPE array of int, length = nr of berths
+            DESCRIPTION. close time of each berth
+        pinned : TYPE array of bool, length = nr of vessels, optional
+            DESCRIPTION. the vessels that keep their berth and start time, none if None.
+                See solution_state for the frozen part of the berths
+        freeze_time : TYPE int, optional
+            DESCRIPTION. the vessels that are not frozen cannot start before this time
+        """
+        self.arrival = arrival
+        self.leaving = leaving
+        self.handling = handling
+        self.cost = cost
+        self.berth_start = berth_start
+        self.berth_close = berth_close
+        if pinned is None:
+            pinned = np.zeros(len(arrival), dtype=bool)
+        self.pinned = pinned
+        self.freeze_time = freeze_time
+        self.nr_vessel = len(arrival)
+        self.nr_berth = len(berth_start)
+        # plain python copies for the scalar loops of the moves, reading numpy arrays 
+        # one element at a time is several times slower
+        self.arrival_list = arrival.tolist()
+        self.leaving_list = leaving.tolist()
+        self.handling_list = handling.tolist()
+        self.cost_list = cost.tolist()
+        self.start_list = berth_start.tolist()
+        self.close_list = berth_close.tolist()
+        self.pinned_list = pinned.tolist()
+
+    @classmethod
+    def from_problem(cls, problem):
+        """
+        collect the static data of a vessel_allocation_problem object. Vessels and berths are
+        indexed by their position in problem.vessels and problem.berths.
+
+        Parameters
+        ----------
+        problem : TYPE vessel_allocation_problem object
+
+        Returns
+        -------
+        TYPE instance_data object
+        """
+        vessels = problem.vessels
+        arrival = np.array([v.arrival for v in vessels], dtype=np.int64)
+        leaving = np.array([v.leaving for v in vessels], dtype=np.int64)
+        handling = np.array([v.handling_time for v in vessels],
+                            dtype=np.int64).reshape(len(vessels), len(problem.berths))
+        cost = np.array([v.cost for v in vessels], dtype=np.float64)
+        berth_start = np.array([b.start for b in problem.berths], dtype=np.int64)
+        berth_close = np.array([b.close for b in problem.berths], dtype=np.int64)
+        pinned = np.array([v.pinned for v in vessels], dtype=bool)
+        return cls(arrival, leaving, handling, cost, berth_start, berth_close, pinned,
+                   problem.freeze_time)
+
+
+class solution_state:
+    def __init__(self, instance, sequences, start, leave, berth_of, running_cost=None,
+                 frozen=None):
+        """
+        compact representation of a solution: for each berth the sequence of vessel indices
+        in operation order, plus the operation start and leave time of every vessel.
+        Copying a state only copies these small arrays, the static data is shared.
+
+        Parameters
+        ----------
+        instance : TYPE instance_data object
+            DESCRIPTION. the static data of the problem
+        sequences : TYPE list of array of int, length = nr of berths
+            DESCRIPTION. vessel indices allocated in each berth, in operation order
+        start : TYPE array of int, length = nr of vessels
+            DESCRIPTION. operation start time of each vessel, -1 if not allocated
+        leave : TYPE array of int, length = nr of vessels
+            DESCRIPTION. real leaving time of each vessel, -1 if not allocated
+        berth_of : TYPE array of int, length = nr of vessels
+            DESCRIPTION. the berth index of each vessel, -1 if not allocated
+        running_cost : TYPE float, optional
+            DESCRIPTION. the total cost of the state, calculated from the arrays if None.
+                It is kept up to date by every move, so it never needs a full rescan.
+        frozen : TYPE (list of int, list of int), optional
+            DESCRIPTION. the frozen part of the berths, see freeze; calculated if None
+        """
+        self.instance = instance
+        self.sequences = sequences
+        self.start = start
+        self.leave = leave
+        self.berth_of = berth_of
+        self.nr_vessel = instance.nr_vessel
+        self.nr_berth = instance.nr_berth
+        if running_cost is None:
+            running_cost = self.recompute_cost()
+        self.running_cost = running_cost
+        if frozen is None:
+            frozen = self.freeze()
+        self.frozen, self.release = frozen
+        self._fingerprint = None  # calculated when first needed
+
+    @classmethod
+    def from_problem(cls, problem, instance=None):
+        """
+        build a solution state from the current allocation of a problem object
+
+        Parameters
+        ----------
+        problem : TYPE vessel_allocation_problem object
+        instance : TYPE instance_data object, optional
+            DESCRIPTION. the static data of the problem, collected from the problem if None
+
+        Returns
+        -------
+        TYPE solution_state object
+        """
+        if instance is None:
+            instance = instance_data.from_problem(problem)
+        position = {id(v): i for i, v in enumerate(problem.vessels)}  # vessel object -> index
+        start = array('q', [-1] * instance.nr_vessel)
+        leave = array('q', [-1] * instance.nr_vessel)
+        berth_of = array('q', [-1] * instance.nr_vessel)
+        sequences = []
+        for j, b in enumerate(problem.berths):
+            allocated = sorted(b.vessels, key=lambda x : x.operation_start)
+            seq = array('q', [position[id(v)] for v in allocated])
+            for v, i in zip(allocated, seq):
+                start[i] = v.operation_start
+                leave[i] = v.real_leaving_time
+                berth_of[i] = j
+            sequences.append(seq)
+        return cls(instance, sequences, start, leave, berth_of)
+
+    @classmethod
+    def from_allocation(cls, instance, sequences, start):
+        """
+        rebuild a state from the output of allocation()
+
+        Parameters
+        ----------
+        instance : TYPE instance_data object
+        sequences : TYPE list of list of int
+            DESCRIPTION. vessel indices allocated in each berth, in operation order
+        start : TYPE list of int
+            DESCRIPTION. operation start time of each vessel, -1 if not allocated
+
+        Returns
+        -------
+        TYPE solution_state object
+        """
+        start = array('q', start)
+        leave = array('q', [-1] * instance.nr_vessel)
+        berth_of = array('q', [-1] * instance.nr_vessel)
+        for j, seq in enumerate(sequences):
+            for i in seq:
+                leave[i] = start[i] + instance.handling_list[i][j]
+                berth_of[i] = j
+        return cls(instance, [array('q', seq) for seq in sequences], start, leave, berth_of)
+
+    def allocation(self):
+        """
+        the mutable part of the state as plain lists, e.g. to send the solution to another
+        process that has the same instance data
+
+        Returns
+        -------
+        sequences : TYPE list of list of int
+        start : TYPE list of int
+        """
+        return [seq.tolist() for seq in self.sequences], self.start.tolist()
+
+    def to_problem(self, problem):
+        """
+        write the allocation of this state into a copy of the problem object
+
+        Parameters
+        ----------
+        problem : TYPE vessel_allocation_problem object
+            DESCRIPTION. the problem from which the state was built, it is not modified
+
+        Returns
+        -------
+        result : TYPE vessel_allocation_problem object
+            DESCRIPTION. a copy of the problem with the allocation of this state
+        """
+        result = copy.deepcopy(problem)
+        self.write_to(result)
+        return result
+
+    def write_to(self, problem):
+        """
+        replace the allocation of the problem object by the allocation of this state
+
+        Parameters
+        ----------
+        problem : TYPE vessel_allocation_problem object
+            DESCRIPTION. the problem from which the state was built, or a copy of it
+        """
+        for v in problem.vessels:
+            v.reset()
+        for j, b in enumerate(problem.berths):
+            b.clear()
+            for i in self.sequences[j]:
+                b.add_vessel(problem.vessels[i], self.start[i])
+
+    def copy(self):
+        """
+        copy the mutable part of the state, the instance data is shared
+
+        Returns
+        -------
+        TYPE solution_state object
+        """
+        return solution_state(self.instance, [seq[:] for seq in self.sequences],
+                              self.start[:], self.leave[:], self.berth_of[:],
+                              self.running_cost, (self.frozen, self.release))
+
+    def freeze(self):
+        """
+        the frozen part of every berth: the sequence up to and including its last pinned
+        vessel (see instance_data.pinned). The schedule of a berth is calculated from the
+        front, so the vessels in front of a pinned vessel are frozen with it. The moves only
+        change the sequences behind the frozen part, which therefore never changes, and the
+        vessels there cannot start before the release time of the berth.
+
+        Returns
+        -------
+        frozen : TYPE list of int, length = nr of berths
+            DESCRIPTION. the number of frozen vessels at the start of each sequence
+        release : TYPE list of int, length = nr of berths
+            DESCRIPTION. the earliest start of the vessels behind the frozen part: the leaving
+                time of the last frozen vessel, or the open time of the berth, and not
+                before the freeze time
+        """
+        inst = self.instance
+        frozen, release = [], []
+        for j, seq in enumerate(self.sequences):
+            n = 0
+            for k, i in enumerate(seq):
+                if inst.pinned_list[i]:
+                    n = k + 1
+            t = self.leave[seq[n - 1]] if n > 0 else inst.start_list[j]
+            if inst.freeze_time is not None:
+                t = max(t, inst.freeze_time)
+            frozen.append(n)
+            release.append(t)
+        return frozen, release
+
+    def movable(self):
+        """
+        the allocated vessels behind the frozen part of their berth, i.e. the vessels the
+        moves may change
+
+        Returns
+        -------
+        TYPE array of int
+            DESCRIPTION. the vessel indices in ascending order
+        """
+        parts = [np.frombuffer(seq, dtype=np.int64)[n:]
+                 for seq, n in zip(self.sequences, self.frozen)]
+        return np.sort(np.concatenate(parts))
+
+    def _pre_leaving(self, berth, index):
+        """
+        the time from which the vessel at the index of the berth can start, as far as the
+        vessels in front of it are concerned
+        """
+        if index == self.frozen[berth]:
+            return self.release[berth]
+        if index > 0:
+            return self.leave[self.sequences[berth][index - 1]]
+        return self.instance.start_list[berth]
+
+    def __eq__(self, rhs):
+        """
+        two states are equal if every vessel has the same berth and the same start time
+        """
+        return self.berth_of == rhs.berth_of and self.start == rhs.start
+
+    def __hash__(self):
+        return self.fingerprint()
+
+    def fingerprint(self):
+        """
+        a compact hash of the solution: the xor of a key for every (vessel, berth, start time).
+        Equal states have equal fingerprints, and a move only changes the keys of the vessels
+        it touches, see fingerprint_after.
+
+        Returns
+        -------
+        TYPE int
+        """
+        if self._fingerprint is None:
+            fp = 0
+            for i in range(self.nr_vessel):
+                fp ^= hash((i, self.berth_of[i], self.start[i]))
+            self._fingerprint = fp
+        return self._fingerprint
+
+    def fingerprint_after(self, proposal):
+        """
+        the fingerprint of the state that commit(proposal) would return, without committing
+
+        Parameters
+        ----------
+        proposal : TYPE move object
+            DESCRIPTION. a feasible move proposed by this state
+
+        Returns
+        -------
+        TYPE int
+        """
+        if proposal.neighbor is not None:
+            return proposal.neighbor.fingerprint()
+        if not proposal.changes:
+            return self.fingerprint()  # the operator found no neighbor, see commit
+        fp = self.fingerprint()
+        for (berth, index, suffix), starts in zip(proposal.changes, proposal.start_times):
+            for i, op_start in zip(suffix, starts):
+                fp ^= hash((i, self.berth_of[i], self.start[i])) ^ hash((i, berth, op_start))
+        return fp
+
+    def all_allocated(self):
+        return -1 not in self.berth_of
+
+    def total_cost(self):
+        """
+        the total cost of all vessels, same as fitness_functions.total_cost.
+        It is the cached running total, so no vessel is visited.
+
+        Returns
+        -------
+        TYPE float
+        """
+        return float(self.running_cost)
+
+    def recompute_cost(self):
+        """
+        calculate the total cost from scratch, not allocated vessels cost nothing
+
+        Returns
+        -------
+        TYPE float
+        """
+        inst = self.instance
+        leave = np.frombuffer(self.leave, dtype=np.int64)
+        allocated = np.frombuffer(self.berth_of, dtype=np.int64) >= 0
+        return float(np.sum(((leave - inst.arrival) * inst.cost)[allocated]))
+
+    def complete_time(self):
+        """
+        the time at which the last operation among all berths ends
+
+        Returns
+        -------
+        TYPE int
+        """
+        times = [self.leave[seq[-1]] if len(seq) else self.instance.start_list[j]
+                 for j, seq in enumerate(self.sequences)]
+        return max(times)
+
+    def may_insert(self, vessel, berth, index):
+        """
+        check whether a vessel can be inserted in a berth before the given index without
+        squeezing out any vessel. The state is not changed.
+
+        Parameters
+        ----------
+        vessel : TYPE int
+            DESCRIPTION. index of the vessel that is going to be inserted
+        berth : TYPE int
+            DESCRIPTION. index of the berth
+        index : TYPE int
+            DESCRIPTION. the position in the berth's sequence to which the vessel is inserted
+
+        Returns
+        -------
+        TYPE boolean
+            DESCRIPTION. True if the vessel and all the vessels behind it still fit their
+                time windows and the closing time of the berth
+        """
+        feasible, start_times, cost_delta = self.propose_suffix(
+            berth, index, [vessel] + list(self.sequences[berth][index:]))
+        return feasible
+
+    def propose_suffix(self, berth, index, suffix):
+        """
+        evaluate a new vessel sequence from the index on in the berth, without changing the
+        state. Works like berth.propose_suffix on the arrays.
+
+        Parameters
+        ----------
+        berth : TYPE int
+            DESCRIPTION. index of the berth
+        index : TYPE int
+            DESCRIPTION. the position from which the sequence is replaced by the suffix
+        suffix : TYPE list of int
+            DESCRIPTION. the new vessel indices behind the first index vessels
+
+        Returns
+        -------
+        TYPE boolean
+            DESCRIPTION. True if every vessel in the suffix fits its time window and the
+                closing time of the berth
+        start_times : TYPE list of int
+            DESCRIPTION. the operation start time of each vessel in the suffix, None if not feasible
+        cost_delta : TYPE float
+            DESCRIPTION. the cost change if the suffix is applied, None if not feasible
+        """
+        if index < self.frozen[berth]:
+            return False, None, None  # the frozen part of the berth cannot change
+        inst = self.instance
+        close = inst.close_list[berth]
+        pre_leaving = self._pre_leaving(berth, index)
+        start_times = []
+        cost_delta = 0.0
+        for i in suffix:
+            handling = inst.handling_list[i][berth]
+            op_start = max(pre_leaving, inst.arrival_list[i])
+            pre_leaving = op_start + handling
+            if handling == FORBIDDEN or pre_leaving > inst.leaving_list[i] or pre_leaving > close:
+                return False, None, None
+            start_times.append(op_start)
+            old_leaving = self.leave[i] if self.leave[i] >= 0 else inst.arrival_list[i]
+            cost_delta += (pre_leaving - old_leaving) * inst.cost_list[i]
+        return True, start_times, cost_delta
+
+    def propose_insert(self, vessel, berth, index):
+        """
+        evaluate inserting an unallocated vessel in the berth before the index
+
+        Returns
+        -------
+        TYPE move object
+            DESCRIPTION. the proposed move, move.feasible is False if any vessel is squeezed out
+        """
+        suffix = [vessel] + list(self.sequences[berth][index:])
+        return self._propose([(berth, index, suffix)])
+
+    def propose_swap(self, v0, v1):
+        """
+        evaluate swapping two vessels between their berths, see swap_between_berths
+
+        Returns
+        -------
+        TYPE move object
+        """
+        b0, b1 = self.berth_of[v0], self.berth_of[v1]
+        seq0, seq1 = self.sequences[b0], self.sequences[b1]
+        ind0, ind1 = seq0.index(v0), seq1.index(v1)
+        return self._propose([(b0, ind0, [v1] + list(seq0[ind0 + 1:])),
+                              (b1, ind1, [v0] + list(seq1[ind1 + 1:]))])
+
+    def propose_move_in_berth(self, moved, before):
+        """
+        evaluate moving a vessel in front of another vessel of the same berth, see move_in_berth
+
+        Returns
+        -------
+        TYPE move object
+        """
+        berth = self.berth_of[moved]
+        seq = list(self.sequences[berth])
+        old_ind = seq.index(moved)
+        del seq[old_ind]
+        new_ind = seq.index(before)
+        seq.insert(new_ind, moved)
+        index = min(old_ind, new_ind)
+        return self._propose([(berth, index, seq[index:])])
+
+    def _propose(self, changes):
+        """
+        evaluate the new suffixes of one or more berths and collect them into a move
+        """
+        start_times = []
+        cost_delta = 0.0
+        for berth, index, suffix in changes:
+            feasible, starts, delta = self.propose_suffix(berth, index, suffix)
+            if not feasible:
+                return move(False, changes)
+            start_times.append(starts)
+            cost_delta += delta
+        return move(True, changes, start_times, cost_delta)
+
+    def commit(self, proposal):
+        """
+        apply a feasible move to a copy of this state
+
+        Parameters
+        ----------
+        proposal : TYPE move object
+            DESCRIPTION. a feasible move proposed by this state
+
+        Returns
+        -------
+        TYPE solution_state object
+            DESCRIPTION. the new state, the state itself if the move has no change
+        """
+        if proposal.neighbor is not None:
+            return proposal.neighbor  # the move was already applied when it was proposed
+        if not proposal.changes:
+            return self
+        new = self.copy()
+        inst = self.instance
+        for (berth, index, suffix), starts in zip(proposal.changes, proposal.start_times):
+            new.sequences[berth] = new.sequences[berth][:index] + array('q', suffix)
+            for i, op_start in zip(suffix, starts):
+                new.start[i] = op_start
+                new.leave[i] = op_start + inst.handling_list[i][berth]
+                new.berth_of[i] = berth
+        new.running_cost += proposal.delta
+        if self._fingerprint is not None:
+            new._fingerprint = self.fingerprint_after(proposal)
+        return new
+
+    def first_feasible_position(self, vessel, berth):
+        """
+        find the first position in the berth's sequence where the vessel can be inserted
+
+        Parameters
+        ----------
+        vessel : TYPE int
+            DESCRIPTION. index of the vessel
+        berth : TYPE int
+            DESCRIPTION. index of the berth
+
+        Returns
+        -------
+        TYPE int
+            DESCRIPTION. the position to which the vessel can be inserted, -1 if not found
+        op_start : TYPE  int
+            DESCRIPTION. the start time for the operation, 500 if not found
+        """
+        inst = self.instance
+        seq = self.sequences[berth]
+        for index in range(self.frozen[berth], len(seq) + 1):
+            if self.may_insert(vessel, berth, index):
+                return index, max(self._pre_leaving(berth, index), inst.arrival_list[vessel])
+        return -1, 500
+
+    def reschedule(self, berth, index):
+        """
+        recalculate the start and leave times of the vessels in the berth from the index on.
+        A vessel that does not fit its time window or the berth's closing time any more is
+        squeezed out of the berth. The running cost is updated with the cost change of the
+        recalculated vessels only.
+
+        Parameters
+        ----------
+        berth : TYPE int
+            DESCRIPTION. index of the berth
+        index : TYPE int
+            DESCRIPTION. the position in the sequence from which the schedule is recalculated
+
+        Returns
+        -------
+        squeezed_out : TYPE list of int
+            DESCRIPTION. indices of the vessels that are squeezed out
+        """
+        inst = self.instance
+        seq = self.sequences[berth]
+        close = inst.close_list[berth]
+        pre_leaving = self._pre_leaving(berth, index)
+        self._fingerprint = None  # the berths and start times are going to change
+        squeezed_out = []
+        kept = array('q')
+        delta = 0.0  # cost change of the recalculated vessels
+        for i in seq[index:]:
+            handling = inst.handling_list[i][berth]
+            op_start = max(pre_leaving, inst.arrival_list[i])
+            # a vessel that was not allocated before (leave == -1) did not cost anything
+            old_leaving = self.leave[i] if self.leave[i] >= 0 else inst.arrival_list[i]
+            if (handling != FORBIDDEN and op_start + handling <= inst.leaving_list[i]
+                and op_start + handling <= close):
+                self.start[i] = op_start
+                self.leave[i] = op_start + handling
+                pre_leaving = op_start + handling
+                kept.append(i)
+                delta += (pre_leaving - old_leaving) * inst.cost_list[i]
+            else:
+                self.start[i] = self.leave[i] = self.berth_of[i] = -1
+                squeezed_out.append(i)
+                delta -= (old_leaving - inst.arrival_list[i]) * inst.cost_list[i]
+        self.running_cost += delta
+        if squeezed_out:
+            self.sequences[berth] = seq[:index] + kept
+        return squeezed_out
+
+    def insert_vessel(self, vessel, berth, index):
+        """
+        insert an unallocated vessel in the berth's sequence before the index and recalculate
+        the schedule behind it
+
+        Returns
+        -------
+        TYPE list of int
+            DESCRIPTION. indices of the vessels that are squeezed out by the insertion
+        """
+        self.sequences[berth].insert(index, vessel)
+        self.berth_of[vessel] = berth
+        return self.reschedule(berth, index)
+
+    def remove_vessel(self, vessel):
+        """
+        remove a vessel from its berth and recalculate the schedule behind it
+        """
+        berth = self.berth_of[vessel]
+        seq = self.sequences[berth]
+        index = seq.index(vessel)
+        del seq[index]
+        inst = self.instance
+        self.running_cost -= (self.leave[vessel] - inst.arrival_list[vessel]) * inst.cost_list[vessel]
+        self.start[vessel] = self.leave[vessel] = self.berth_of[vessel] = -1
+        self.reschedule(berth, index)
+
+    def swap_between_berths(self, v0, v1):
+        """
+        swap two vessels between their berths, each one takes the other's place in the sequence
+
+        Parameters
+        ----------
+        v0 : TYPE int
+            DESCRIPTION. index of vessel 0
+        v1 : TYPE int
+            DESCRIPTION. index of vessel 1
+
+        Returns
+        -------
+        TYPE list of int
+            DESCRIPTION. indices of the vessels that are squeezed out in both berths
+        """
+        b0, b1 = self.berth_of[v0], self.berth_of[v1]
+        ind0 = self.sequences[b0].index(v0)
+        ind1 = self.sequences[b1].index(v1)
+        self.sequences[b0][ind0] = v1
+        self.sequences[b1][ind1] = v0
+        self.berth_of[v0], self.berth_of[v1] = b1, b0
+        return self.reschedule(b0, ind0) + self.reschedule(b1, ind1)
+
+    def move_in_berth(self, moved, before):
+        """
+        move a vessel in front of another vessel of the same berth
+
+        Parameters
+        ----------
+        moved : TYPE int
+            DESCRIPTION. index of the vessel that is moved
+        before : TYPE int
+            DESCRIPTION. index of the vessel before which the moved vessel is put
+
+        Returns
+        -------
+        TYPE list of int
+            DESCRIPTION. indices of the vessels that are squeezed out
+        """
+        berth = self.berth_of[moved]
+        seq = self.sequences[berth]
+        old_ind = seq.index(moved)
+        del seq[old_ind]
+        new_ind = seq.index(before)
+        seq.insert(new_ind, moved)
+        return self.reschedule(berth, min(old_ind, new_ind))
+
+
+class move:
+    def __init__(self, feasible, changes, start_times=None, delta=0.0, neighbor=None):
+        """
+        a move proposed by a solution_state. It is only applied by solution_state.commit,
+        so rejected moves never touch any array.
+
+        Parameters
+        ----------
+        feasible : TYPE bool
+            DESCRIPTION. False if the move squeezes any vessel out of its berth
+        changes : TYPE list of (int, int, list of int)
+            DESCRIPTION. for every changed berth: berth index, position from which the
+                sequence changes, and the new vessel indices from that position on
+        start_times : TYPE list of list of int
+            DESCRIPTION. the new start times of the vessels in each changed suffix
+        delta : TYPE float
+            DESCRIPTION. the change of the total cost
+        neighbor : TYPE solution_state object, optional
+            DESCRIPTION. the resulting state, if the move had to be applied already
+                (e.g. after re-allocating squeezed out vessels)
+        """
+        self.feasible = feasible
+        self.changes = changes
+        self.start_times = start_times
+        self.delta = delta
+        self.neighbor = neighbor
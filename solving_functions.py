@@ -6,18 +6,25 @@ Created on Fri Apr  1 20:55:08 2022
 """
 import numpy as np
 import copy
-from operators import swap_between_berths, move_in_berth
+import time
+from functools import partial
+from operators import swap_between_berths, move_in_berth, candidate_moves, propose_candidate
+from operators import random_removal, worst_removal, related_removal, time_window_removal
+from operators import greedy_insertion, regret_insertion
 from fitness_functions import total_cost, complete_time
-import matplotlib.pyplot as plt
+from solution_state import solution_state
+from tabu_memory import tabu_list
 
 operators = [swap_between_berths, move_in_berth]
+destroy_operators = [random_removal, worst_removal, related_removal, time_window_removal]
+repair_operators = [greedy_insertion, partial(regret_insertion, k=2), partial(regret_insertion, k=3)]
 
 def fcfs(problem):
     """
     generate a soluiton by first come first serve rule. Allocate vessels to the earliest available
     berth.
-    assume that all vessels in the problem has not been allocated. If there's any, use problem.reset()
-    to remove all allocations.
+    the vessels that are allocated and not frozen are taken out first, the frozen ones keep their
+    allocation (see problem.freeze and problem.detach_unfrozen).
 
     Parameters
     ----------
@@ -35,27 +42,35 @@ def fcfs(problem):
         DESCRIPTION.  solution
 
     """
-    vessels = problem.vessels  # list of vessels
+    release = problem.detach_unfrozen()
+    vessels = [v for v in problem.vessels if not v.is_allocated]  # list of vessels
     vessels.sort(key=lambda x : x.arrival)  # sort vessle according to arrival time ascendingly
     vessel_ind = 0
-    while (vessel_ind < len(problem.vessels)):
+    while (vessel_ind < len(vessels)):
         # when there are still vessels not considered, continue the while loop
-        to_ber, start_time = problem.nearest_available_berth(vessels[vessel_ind])  # find the nearest available berth
+        to_ber, start_time = problem.nearest_available_berth(vessels[vessel_ind], release)  # find the nearest available berth
         if to_ber is not None:
             to_ber.add_vessel(vessels[vessel_ind], start_time)  # add the vessel to the first available berth                      
             vessel_ind += 1;            
         else:
             raise Exception(f"fcfs failed, {vessels[vessel_ind].id} cannot find an available berth")
-    vessels.sort(key=lambda x : int(x.id[7:]))
+    for b in problem.berths:
+        b.sort_vessels()
     return problem
 
-def alloc_by_time_window_size(problem):
+def alloc_by_time_window_size(problem, rng=None, max_restarts=1000):
     """
-    allocate the vessels by their time window size (from larger to smaller time window)
+    allocate the vessels by their time window size (from larger to smaller time window).
+    The frozen vessels keep their allocation, see problem.detach_unfrozen
 
     Parameters
     ----------
     problem : TYPE problem object
+    rng : TYPE numpy.random.Generator or int, optional
+        DESCRIPTION. the random number generator for the berth order, or a seed for a new one
+    max_restarts : TYPE int, optional
+        DESCRIPTION. the allocation starts again with new random berth choices when a vessel
+            fits in no berth, at most this many times
 
     Raises
     ------
@@ -66,22 +81,28 @@ def alloc_by_time_window_size(problem):
     -------
     problem : the problem with allocated vessels
     """  
+    rng = np.random.default_rng(rng)
     orig = copy.deepcopy(problem)
+    release = orig.detach_unfrozen()
     all_allocated = False
+    restarts = 0
     while (not all_allocated):
+        if restarts > max_restarts:
+            raise Exception(f"alloc_by_time_window_size failed after {max_restarts} restarts, "
+                            "try greedy_construction")
+        restarts += 1
         end_vessel_loop = False
         problem = copy.deepcopy(orig)
-        vessels = problem.vessels  # list of vessels
+        vessels = [v for v in problem.vessels if not v.is_allocated]  # list of vessels
         vessels.sort(key=lambda x : (x.leaving - x.arrival), reverse=True)  # sort vessle according to tw size descendingly
         vessel_ind = 0
-        while (vessel_ind < len(problem.vessels) and not end_vessel_loop):   
+        while (vessel_ind < len(vessels) and not end_vessel_loop):   
             start_time = 500           
-            checklist = copy.deepcopy(problem.berths)
+            checklist = list(problem.berths)  # the berths not tried yet for this vessel
             while (start_time == 500 and len(checklist) != 0):    
-                selc_berth = np.random.choice(checklist)
-                to_ber = problem.get_berth(selc_berth.id)
-                checklist.remove(selc_berth)                    
-                start_time, slot_ind = to_ber.first_available_slot(vessels[vessel_ind])              
+                to_ber = checklist.pop(rng.integers(len(checklist)))
+                start_time, slot_ind = to_ber.first_available_slot(vessels[vessel_ind],
+                                                                   release[to_ber.index])
             if (start_time != 500):                    
                 to_ber.add_vessel(vessels[vessel_ind], start_time)
                 vessel_ind += 1 
@@ -92,29 +113,192 @@ def alloc_by_time_window_size(problem):
     
     # sort the vessel list of all berths by vessels operation start time
     for b in problem.berths:
-        b.vessels.sort(key=lambda x : x.operation_start)
+        b.sort_vessels()
                
-    vessels.sort(key=lambda x : int(x.id[7:]))
     return problem
 
-def local_search(problem, max_iter):
+def greedy_construction(problem):
+    """
+    deterministic construction: the vessels are taken by priority and each one is put in the
+    free slot (see berth.first_available_slot) of the berth where it leaves earliest, i.e.
+    with the smallest cost increase. The vessels that fit in no free slot are inserted
+    afterwards by operators.regret_insertion, which may delay the vessels behind them.
+    The construction is done with three priority orders: the highest cost per unit time
+    first (among equal costs the smallest slack in the time window), the order of arrival
+    (as fcfs) and the order of the leaving time, and the cheapest complete allocation is
+    returned. No order is best on all instances, and with tight time windows some orders
+    fail. Every vessel is tried a bounded number of times, so the construction always ends.
+    The frozen vessels keep their allocation, see problem.detach_unfrozen.
+
+    Parameters
+    ----------
+    problem : TYPE vessel_allocation_problem object
+        DESCRIPTION. the problem, it is not modified
+
+    Raises
+    ------
+    Exception
+        DESCRIPTION. if some vessels cannot be inserted in any of the orders
+
+    Returns
+    -------
+    problem : TYPE vessel_allocation_problem object
+        DESCRIPTION. a copy of the problem with all vessels allocated
+    """
+    def slack(v):
+        allowed = [h for h in v.handling_time if h != 200]
+        return v.leaving - v.arrival - min(allowed, default=0)
+    priorities = [lambda v : (-v.cost, slack(v), v.index),  # cost-aware
+                  lambda v : (v.arrival, v.index),  # first come first serve
+                  lambda v : (v.leaving, v.arrival, v.index)]  # earliest deadline first
+    best, best_cost = None, np.inf
+    for priority in priorities:
+        solution = _insert_by_priority(problem, priority)
+        if solution is not None and total_cost(solution) < best_cost:
+            best, best_cost = solution, total_cost(solution)
+    if best is None:
+        raise Exception("greedy_construction failed, some vessels cannot be inserted")
+    return best
+
+def _insert_by_priority(problem, priority):
+    """
+    one pass of greedy_construction with the vessels sorted by the priority key,
+    None if some vessels cannot be inserted
+    """
+    problem = copy.deepcopy(problem)
+    release = problem.detach_unfrozen()
+    not_placed = []
+    for v in sorted([v for v in problem.vessels if not v.is_allocated], key=priority):
+        best = None  # (leaving time, berth, start time)
+        for b in problem.berths:
+            start_time, slot_ind = b.first_available_slot(v, release[b.index])
+            if slot_ind != -1 and (best is None or start_time + v.handling_time[b.index] < best[0]):
+                best = (start_time + v.handling_time[b.index], b, start_time)
+        if best is None:
+            not_placed.append(v)
+        else:
+            best[1].add_vessel(v, best[2])
+    for b in problem.berths:
+        b.sort_vessels()
+    if not_placed:
+        state = solution_state.from_problem(problem)
+        position = {id(v): i for i, v in enumerate(problem.vessels)}
+        if not regret_insertion(state, [position[id(v)] for v in not_placed]):
+            return None
+        problem = state.to_problem(problem)
+    return problem
+
+def _to_state(problem):
+    """
+    the solvers accept a vessel_allocation_problem object or a solution_state, and return
+    the same kind of object
+    """
+    if isinstance(problem, solution_state):
+        return problem
+    return solution_state.from_problem(problem)
+
+def _from_state(state, problem):
+    if isinstance(problem, solution_state):
+        return state
+    return state.to_problem(problem)
+
+class stopping_rule:
+    def __init__(self, time_limit=None, stagnation=None, target_cost=None):
+        """
+        the early stopping criteria of the solvers, besides their iteration counts
+
+        Parameters
+        ----------
+        time_limit : TYPE float, optional
+            DESCRIPTION. wall-clock budget in seconds, counted from the creation of the rule
+        stagnation : TYPE int, optional
+            DESCRIPTION. stop after this many iterations without improving the best cost
+        target_cost : TYPE float, optional
+            DESCRIPTION. stop as soon as the best cost is lower than or equal to this
+        """
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.stagnation = stagnation
+        self.target_cost = target_cost
+        self.best = np.inf
+        self.since_improvement = 0
+
+    def __call__(self, best_cost):
+        """
+        called once per iteration with the best cost found so far
+
+        Returns
+        -------
+        TYPE bool
+            DESCRIPTION. True if the solver should stop
+        """
+        if best_cost < self.best:
+            self.best = best_cost
+            self.since_improvement = 0
+        else:
+            self.since_improvement += 1
+        return ((self.deadline is not None and time.perf_counter() >= self.deadline)
+                or (self.stagnation is not None and self.since_improvement >= self.stagnation)
+                or (self.target_cost is not None and best_cost <= self.target_cost))
+
+def local_search(problem, max_iter, rng=None, callback=None, time_limit=None, stagnation=None,
+                 target_cost=None):
+    """
+    the solvers below share these arguments:
+    rng : TYPE numpy.random.Generator or int, optional
+        DESCRIPTION. the random number generator, or a seed for a new one
+    callback : TYPE function (iteration, fitness), optional
+        DESCRIPTION. called with the current (best) fitness at the start and after every 
+            iteration, e.g. a reporting.convergence_trace to plot the convergence afterwards
+    time_limit, stagnation, target_cost : TYPE float, int, float, optional
+        DESCRIPTION. stop before the iteration budget is used up, see stopping_rule
+    """
     print("...local search...")    
-    cur_fit = total_cost(problem)
-    cur_problem = copy.deepcopy(problem)
-    fit = [cur_fit]
-    for _ in range(max_iter):
-        f = np.random.choice(operators)
-        new_neighbor = f(problem)
-        if (new_neighbor.vessels):
-            neighbor_fit = total_cost(new_neighbor)
-            if neighbor_fit <= cur_fit:
-                cur_fit = neighbor_fit
-                cur_problem = copy.deepcopy(new_neighbor)
-        fit.append(cur_fit)
-    plt.plot(fit)
-    plt.title("fitness in local search")
-    plt.show()
-    return cur_problem
+    stop = stopping_rule(time_limit, stagnation, target_cost)
+    rng = np.random.default_rng(rng)
+    cur_problem = _to_state(problem)  # current solution
+    cur_fit = total_cost(cur_problem)
+    if callback is not None:
+        callback(0, cur_fit)
+    for it in range(1, max_iter + 1):
+        f = operators[rng.integers(len(operators))]
+        proposal = f(cur_problem, rng)
+        if proposal.delta <= 0:
+            cur_fit += proposal.delta
+            cur_problem = cur_problem.commit(proposal)  # only accepted moves are applied
+        if callback is not None:
+            callback(it, cur_fit)
+        if stop(cur_fit):
+            break
+    return _from_state(cur_problem, problem)
+
+def steepest_descent(problem, max_iter, rng=None, callback=None, time_limit=None, stagnation=None,
+                     target_cost=None, max_candidates=None):
+    """
+    best-improvement local search: every iteration scores a batch of neighbors at once
+    (see operators.candidate_moves) and applies the best improving one. It stops early at a
+    local optimum. max_candidates samples the batch instead of scoring every neighbor
+    """
+    print("...steepest descent...")
+    stop = stopping_rule(time_limit, stagnation, target_cost)
+    rng = np.random.default_rng(rng)
+    cur_problem = _to_state(problem)  # current solution
+    cur_fit = total_cost(cur_problem)
+    if callback is not None:
+        callback(0, cur_fit)
+    for it in range(1, max_iter + 1):
+        kind, a, b, delta = candidate_moves(cur_problem, max_candidates, rng)
+        if len(delta) == 0 or delta[0] >= -1e-9:
+            if max_candidates is None:
+                break  # no improving neighbor left
+        else:
+            proposal = propose_candidate(cur_problem, kind[0], a[0], b[0])
+            cur_fit += proposal.delta
+            cur_problem = cur_problem.commit(proposal)
+        if callback is not None:
+            callback(it, cur_fit)
+        if stop(cur_fit):
+            break
+    return _from_state(cur_problem, problem)
 
 def berth_utilization(problem):
     availableTime = []
@@ -123,104 +307,238 @@ def berth_utilization(problem):
         if len(b.schedule):
             availableTime.append(0)
             for j in b.schedule:
-                availableTime[int(b.id[6:])] += (j[1]-j[0])  
+                availableTime[b.index] += (j[1]-j[0])  
         else:
             availableTime.append(0)
-        tempval = (b.close - b.start - availableTime[int(b.id[6:])])/int(b.close - b.start)
+        if b.close <= b.start:
+            berth_utility.append(0.0)  # the berth is closed, see close_berth
+            continue
+        tempval = (b.close - b.start - availableTime[b.index])/int(b.close - b.start)
         berth_utility.append(tempval)
     print(berth_utility)
     return berth_utility
         
-def tabu_search(problem, max_iter):
+def tabu_search(problem, max_iter, tabu_length=100, rng=None, callback=None, time_limit=None,
+                stagnation=None, target_cost=None, max_tabu_hits=1000):
+    """
+    max_iter counts the neighbors that are not in the tabu list. The search stops early after
+    max_tabu_hits tabu neighbors in a row, e.g. when the operators find no neighbor at all
+    """
     print("...tabu search...")
-    cur_fit = total_cost(problem)  # current fitness 
-    cur_problem = copy.deepcopy(problem)  # current solution
-    fit = [cur_fit]   # the list for storing the fitnesses as the iteration goes
-    tabu_length = 100  # max length of the tabu list
-    tabuList = []  
+    stop = stopping_rule(time_limit, stagnation, target_cost)
+    rng = np.random.default_rng(rng)
+    cur_problem = _to_state(problem)  # current solution
+    cur_fit = total_cost(cur_problem)  # current fitness 
+    step = 0  # number of tried neighbors, including the ones in the tabu list
+    if callback is not None:
+        callback(step, cur_fit)
+    tabuList = tabu_list(tabu_length)  # fingerprints of the last "tabu_length" solutions
     iter_count = 0  
-    while (iter_count <= max_iter):
-        f = np.random.choice(operators)
-        new_neighbor = f(problem)  
-        if (new_neighbor.vessels and (new_neighbor not in tabuList)):  # check if the solution is feasible and if it is in the tabu list
-            neighbor_fit = total_cost(new_neighbor)
-            if neighbor_fit <= cur_fit:
-                cur_fit = neighbor_fit
-                cur_problem = copy.deepcopy(new_neighbor)
-            tabuList.append(cur_problem)
-            if len(tabuList) > tabu_length:
-                tabuList = tabuList[-tabu_length:]  # only keep the last "tabu_length" elements in tabu list          
+    tabu_hits = 0  # tabu neighbors since the last valid one
+    while (iter_count <= max_iter and tabu_hits < max_tabu_hits):
+        f = operators[rng.integers(len(operators))]
+        proposal = f(cur_problem, rng)  
+        if cur_problem.fingerprint_after(proposal) not in tabuList:  # check if the solution is in the tabu list
+            if proposal.delta <= 0:
+                cur_fit += proposal.delta
+                cur_problem = cur_problem.commit(proposal)
+            tabuList.add(cur_problem.fingerprint())
             iter_count += 1  # only update the count when an valid neighbor is found 
-        fit.append(cur_fit)       
-    plt.plot(fit)
-    plt.title("fitness in tabu search")
-    plt.show()
-    return cur_problem
-
-from pareto_dominated import not_dominated
-def pareto_local_search(problem, max_iter):
+            tabu_hits = 0
+        else:
+            tabu_hits += 1
+        step += 1
+        if callback is not None:
+            callback(step, cur_fit)
+        if stop(cur_fit):
+            break
+    return _from_state(cur_problem, problem)
+
+def best_admissible_tabu_search(problem, max_iter, tabu_length=100, rng=None, callback=None,
+                                time_limit=None, stagnation=None, target_cost=None,
+                                max_candidates=None):
+    """
+    tabu search that moves to the best neighbor of a scored batch (see
+    operators.candidate_moves) whose solution is not in the tabu list, even if it is worse
+    than the current one. A tabu neighbor is still taken if it is better than the best
+    solution found so far. Returns the best solution found
+    """
+    print("...best admissible tabu search...")
+    stop = stopping_rule(time_limit, stagnation, target_cost)
+    rng = np.random.default_rng(rng)
+    cur_problem = _to_state(problem)  # current solution
+    cur_fit = total_cost(cur_problem)
+    best_problem, best_fit = cur_problem, cur_fit
+    if callback is not None:
+        callback(0, best_fit)
+    tabuList = tabu_list(tabu_length)  # fingerprints of the last "tabu_length" solutions
+    tabuList.add(cur_problem.fingerprint())
+    for it in range(1, max_iter + 1):
+        kind, a, b, delta = candidate_moves(cur_problem, max_candidates, rng)
+        chosen = None
+        for k in range(len(delta)):
+            proposal = propose_candidate(cur_problem, kind[k], a[k], b[k])
+            if (cur_fit + proposal.delta < best_fit  # aspiration
+                or cur_problem.fingerprint_after(proposal) not in tabuList):
+                chosen = proposal
+                break
+        if chosen is None:
+            break  # every neighbor is tabu
+        cur_fit += chosen.delta
+        cur_problem = cur_problem.commit(chosen)
+        tabuList.add(cur_problem.fingerprint())
+        if cur_fit < best_fit:
+            best_problem, best_fit = cur_problem, cur_fit
+        if callback is not None:
+            callback(it, best_fit)
+        if stop(best_fit):
+            break
+    return _from_state(best_problem, problem)
+
+from pareto_dominated import pareto_archive
+def pareto_local_search(problem, max_iter, rng=None, time_limit=None, stagnation=None,
+                        target_cost=None, max_front=None):
+    """
+    local search on the Pareto front of total cost and complete time. Returns the solutions
+    of the front, sorted by cost. max_front bounds the size of the front, see pareto_archive
+    """
     print("...pareto local search...")
-    explored_list = []  # list for solutions that has been explored
-    list_length = 50
-    cur_problem = copy.deepcopy(problem)  # current problem
-    front = [cur_problem]  # for storing pareto fronts
+    stop = stopping_rule(time_limit, stagnation, target_cost)  # on the lowest cost in the front
+    rng = np.random.default_rng(rng)
+    explored = tabu_list(50)  # fingerprints of the last solutions that were dropped or rejected
+    cur_problem = _to_state(problem)  # current problem
+    front = pareto_archive(max_front)  # for storing pareto fronts
+    front.add(cur_problem, total_cost(cur_problem), complete_time(cur_problem))
     iter_count = 0
     
     while(iter_count <= max_iter):
-        cur_problem = np.random.choice(front)  # randomly select one solution in the front list
-        f = np.random.choice(operators)  # choose an operator
-        new_neighbor = f(cur_problem)  # generate a new neighbor 
-        if new_neighbor not in explored_list:
-            new_dominated = False  # true if the new solution is dominated by any solution in the front
-            for solution in front:  # compare the neighbor with all solutions in the front list         
-                new_not_domi_by_exist = not_dominated(solution, new_neighbor)  # return true if new is not dominated by the existing solution
-                exist_not_domi_by_new = not_dominated(new_neighbor, solution)              
-                if not new_not_domi_by_exist:  # if new is dominated by existing solution
-                    new_dominated = True  # if new is dominated by any existing one
-                    explored_list.append(copy.deepcopy(new_neighbor))  # add new solution to explored list if dominated by any
-                elif not exist_not_domi_by_new:  # if existing is dominated by new
-                     explored_list.append(solution)  # the existing solution be added to the explored list
-                     front.remove(solution)  # remove the existing solution from the front 
-            if not new_dominated:    # if new is not dominated by any existing one        
-                front.append(copy.deepcopy(new_neighbor)) 
-            
-            # adjust the explored list if necessary
-            no_longer_than = len(explored_list) <= list_length
-            while not no_longer_than:
-                explored_list.pop(0)  # if longer than max length
-                no_longer_than = len(explored_list) <= list_length
-            
+        cur_problem = front[rng.integers(len(front))]  # randomly select one solution in the front list
+        f = operators[rng.integers(len(operators))]  # choose an operator
+        new_neighbor = cur_problem.commit(f(cur_problem, rng))  # generate a new neighbor 
+        fp = new_neighbor.fingerprint()
+        if fp not in explored:
+            added, removed = front.add(new_neighbor, total_cost(new_neighbor),
+                                       complete_time(new_neighbor))
+            if not added:
+                explored.add(fp)  # the new solution is dominated by a member of the front
+            for solution in removed:
+                explored.add(solution.fingerprint())  # the members dominated by the new one
         iter_count += 1
-    return front
+        if stop(front.costs[0]):
+            break
+    return [_from_state(solution, problem) for solution in front]
 
-def simulated_annealing(problem, initial_temperature=500, end_temperature=1, alpha=0.99, max_iters=1000):
+def simulated_annealing(problem, initial_temperature=500, end_temperature=1, alpha=0.99, max_iters=1000,
+                        rng=None, callback=None, time_limit=None, stagnation=None, target_cost=None):
     print("...simulated annealing...")
-    current_solution = problem
-    current_value = total_cost(problem)
+    stop = stopping_rule(time_limit, stagnation, target_cost)
+    rng = np.random.default_rng(rng)
+    current_solution = _to_state(problem)
+    current_value = total_cost(current_solution)
     current_temperature = initial_temperature
-    best_solution = copy.deepcopy(current_solution)
+    best_solution = current_solution
+    best_value = current_value
     iter_count = 0
-    fit = [current_value]
+    if callback is not None:
+        callback(iter_count, best_value)
     while (current_temperature >= end_temperature or iter_count <= max_iters):
-        f = np.random.choice(operators)  # choose the operator
-        candidate_solution = f(problem)
-        candidate_value = total_cost(candidate_solution)
-        delta = candidate_value - current_value
+        f = operators[rng.integers(len(operators))]  # choose the operator
+        proposal = f(current_solution, rng)
+        delta = proposal.delta
         acceptance_probability = np.exp(-abs(delta / 10000) / current_temperature)
         if delta <= 0:  # if new neighbor has a lower cost
-            current_solution = candidate_solution
-            current_value = candidate_value
-            if total_cost(best_solution) >= current_value:
-                best_solution = copy.deepcopy(current_solution)
-        elif acceptance_probability >= np.random.random():
-            current_solution = candidate_solution
-            current_value = candidate_value
+            current_solution = current_solution.commit(proposal)
+            current_value += delta
+            if best_value >= current_value:
+                best_solution = current_solution
+                best_value = current_value
+        elif acceptance_probability >= rng.random():
+            current_solution = current_solution.commit(proposal)
+            current_value += delta
         # update the temperature and iteration count
         current_temperature *= alpha
         iter_count += 1
-        fit.append(total_cost(best_solution))
-    plt.plot(fit)
-    plt.title("simulated annealing")
-    plt.show()
-    return best_solution
+        if callback is not None:
+            callback(iter_count, best_value)
+        if stop(best_value):
+            break
+    return _from_state(best_solution, problem)
+
+def adaptive_large_neighborhood_search(problem, max_iter=2000, max_remove=None,
+                                       temperature_ratio=0.05, segment=100, reaction=0.2,
+                                       rng=None, callback=None, time_limit=None,
+                                       stagnation=None, target_cost=None):
+    """
+    every iteration removes several vessels with a destroy operator and inserts them again
+    with a repair operator (see destroy_operators and repair_operators). The operators are
+    drawn with adaptive weights: after every segment of iterations the weight of an operator
+    moves towards its average score (33 for a new best solution, 9 for an improvement of the
+    current one, 13 for an accepted worse one). Worse solutions are accepted as in
+    simulated annealing.
 
+    Parameters
+    ----------
+    max_remove : TYPE int, optional
+        DESCRIPTION. max number of vessels removed per iteration, by default a fifth of the
+            movable vessels but at most 40. At least 2 vessels are removed
+    temperature_ratio : TYPE float, optional
+        DESCRIPTION. the initial temperature accepts a solution this fraction worse than the
+            initial one with probability 0.5, it decreases to 1% of that until max_iter
+    segment : TYPE int, optional
+        DESCRIPTION. number of iterations between two weight updates
+    reaction : TYPE float, optional
+        DESCRIPTION. between 0 and 1, how fast the weights follow the scores
+    """
+    print("...adaptive large neighborhood search...")
+    stop = stopping_rule(time_limit, stagnation, target_cost)
+    rng = np.random.default_rng(rng)
+    cur_problem = _to_state(problem)  # current solution
+    cur_fit = total_cost(cur_problem)
+    best_problem, best_fit = cur_problem, cur_fit
+    nr_movable = len(cur_problem.movable())  # the frozen vessels are never removed
+    if nr_movable == 0:
+        return _from_state(cur_problem, problem)
+    if max_remove is None:
+        max_remove = min(nr_movable // 5, 40)
+    max_remove = max(max_remove, 2)
+    temperature = -temperature_ratio * cur_fit / np.log(0.5)
+    alpha = 0.01 ** (1 / max_iter)
+    weights = [np.ones(len(destroy_operators)), np.ones(len(repair_operators))]
+    scores = [np.zeros(len(destroy_operators)), np.zeros(len(repair_operators))]
+    uses = [np.zeros(len(destroy_operators)), np.zeros(len(repair_operators))]
+    if callback is not None:
+        callback(0, best_fit)
+    for it in range(1, max_iter + 1):
+        d = rng.choice(len(destroy_operators), p=weights[0] / weights[0].sum())
+        r = rng.choice(len(repair_operators), p=weights[1] / weights[1].sum())
+        candidate = cur_problem.copy()
+        removed = destroy_operators[d](candidate, rng.integers(2, max_remove + 1), rng)
+        for v in removed:
+            candidate.remove_vessel(v)
+        score = 0
+        if repair_operators[r](candidate, removed, rng):
+            delta = candidate.running_cost - cur_fit
+            if candidate.running_cost < best_fit:
+                best_problem, best_fit = candidate, candidate.running_cost
+                score = 33
+            elif delta < 0:
+                score = 9
+            elif rng.random() < np.exp(-delta / temperature):
+                score = 13
+            if score:
+                cur_problem, cur_fit = candidate, candidate.running_cost
+        for k, op in enumerate((d, r)):
+            scores[k][op] += score
+            uses[k][op] += 1
+        if it % segment == 0:  # adapt the weights to the scores of the last segment
+            for k in range(2):
+                weights[k] = ((1 - reaction) * weights[k]
+                              + reaction * scores[k] / np.maximum(uses[k], 1))
+                scores[k][:] = 0
+                uses[k][:] = 0
+        temperature *= alpha
+        if callback is not None:
+            callback(it, best_fit)
+        if stop(best_fit):
+            break
+    return _from_state(best_problem, problem)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:58:17 2026
+
+@author: kaiyu.wei
+"""
+from collections import deque
+
+class tabu_list:
+    def __init__(self, tenure):
+        """
+        the tabu memory of tabu search. It stores solution fingerprints (see
+        solution_state.fingerprint) instead of solutions, in a deque for the FIFO order and a
+        dict of counts for the membership test, so both adding and checking are O(1).
+
+        Parameters
+        ----------
+        tenure : TYPE int
+            DESCRIPTION. max number of fingerprints in the list, the oldest one is dropped
+                when the list is full
+        """
+        self.tenure = tenure
+        self.queue = deque()
+        self.counts = {}  # fingerprint -> number of times it is in the queue
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self.counts
+
+    def __len__(self):
+        return len(self.queue)
+
+    def add(self, fingerprint):
+        """
+        add a fingerprint to the list, drop the oldest one if the list is longer than the tenure
+        """
+        self.queue.append(fingerprint)
+        self.counts[fingerprint] = self.counts.get(fingerprint, 0) + 1
+        if len(self.queue) > self.tenure:
+            oldest = self.queue.popleft()
+            self.counts[oldest] -= 1
+            if self.counts[oldest] == 0:
+                del self.counts[oldest]
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:05:12 2026
+
+@author: kaiyu.wei
+
+regression tests of the solvers, run with python -m pytest
+"""
+import os
+import tempfile
+import numpy as np
+import pytest
+from vessel_allocation_problem import vessel_allocation_problem
+from solution_state import solution_state
+from solving_functions import greedy_construction, alloc_by_time_window_size, tabu_search
+from operators import swap_between_berths, move_in_berth
+from instance_generator import generate_instance, write_instance
+from multi_start import multi_start
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def load(name):
+    return vessel_allocation_problem.from_file(os.path.join(HERE, name))
+
+def from_instance(instance):
+    f, filename = tempfile.mkstemp(suffix=".txt")
+    os.close(f)
+    try:
+        write_instance(filename, instance)
+        return vessel_allocation_problem.from_file(filename)
+    finally:
+        os.remove(filename)
+
+def frozen_state():
+    """
+    a solution of scenario01 in which every vessel is pinned, so no operator finds a neighbor
+    """
+    problem = greedy_construction(load("scenario01.txt"))
+    for v in problem.vessels:
+        v.pinned = True
+    return solution_state.from_problem(problem)
+
+def test_fingerprint_after_no_neighbor():
+    state = frozen_state()
+    rng = np.random.default_rng(0)
+    for operator in [swap_between_berths, move_in_berth]:
+        proposal = operator(state, rng)
+        assert proposal.feasible and not proposal.changes
+        assert state.fingerprint_after(proposal) == state.fingerprint()
+        assert state.commit(proposal) is state
+
+def test_tabu_search_ends_without_neighbors():
+    # every neighbor is tabu: the operators only propose the current solution
+    state = frozen_state()
+    assert tabu_search(state, 100, rng=0) is state
+
+def test_tabu_search_ends_on_tight_instance():
+    instance = generate_instance(8, 3, window_tightness=1, rng=0)
+    problem = from_instance(instance)
+    solution = tabu_search(greedy_construction(problem), 200, rng=0)
+    assert solution.all_allocated()[0]
+
+def test_close_berth_keeps_frozen_vessels():
+    problem = greedy_construction(load("scenario01.txt"))
+    problem.freeze(60)
+    b = problem.berths[0]
+    frozen, release = problem.frozen_part(b)
+    assert frozen
+    with pytest.raises(ValueError):
+        problem.close_berth(b.id, frozen[-1].real_leaving_time - 1, rng=0)
+    pinned = {v.id: (v.berth.id, v.operation_start) for v in problem.vessels if v.pinned}
+    problem.close_berth(b.id, release, rng=0)
+    assert {v.id: (v.berth.id, v.operation_start) for v in problem.vessels if v.pinned} == pinned
+    assert all(v.real_leaving_time <= release for v in b.vessels)
+
+def test_multi_start_keeps_frozen_vessels():
+    # a plan that the constructions in the workers would not build again
+    problem = alloc_by_time_window_size(load("scenario01.txt"), 0)
+    problem.freeze(60)
+    pinned = {v.id: (v.berth.id, v.operation_start) for v in problem.vessels if v.pinned}
+    best, stats = multi_start(problem, "local_search", 2, max_workers=2, initial="greedy",
+                              max_iter=200)
+    assert {v.id: (v.berth.id, v.operation_start) for v in best.vessels if v.pinned} == pinned
+    assert all(v.operation_start >= 60 for v in best.vessels if not v.pinned)
+
+def test_exact_solve_uses_warm_start():
+    pytest.importorskip("ortools")
+    from exact_solver import exact_solve
+    problem = load("scenario01.txt")
+    warm_start = tabu_search(greedy_construction(problem), 5000, rng=0)
+    solution, info = exact_solve(problem, time_limit=5, warm_start=warm_start)
+    assert info["status"] in ("OPTIMAL", "FEASIBLE")
+    assert info["first_cost"] == pytest.approx(warm_start.total_cost())  # the hint was taken
+    assert info["cost"] <= warm_start.total_cost() + 1e-6
+    assert info["cost"] == pytest.approx(solution.total_cost())
+    assert 0 <= info["gap"] < 0.05
+    assert info["bound"] <= info["cost"] + 1e-6
+    assert solution.all_allocated()[0]
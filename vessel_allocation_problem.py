@@ -6,7 +6,9 @@ Created on Fri Apr  1 11:36:11 2022
 """
 import numpy as np
 import copy
-import itertools
+import hashlib
+import os
+from free_slots import free_slots
 
 class vessel_allocation_problem:   
     def __init__(self, vessels, berths):
@@ -23,9 +25,12 @@ class vessel_allocation_problem:
         self.berths = berths
         self.nr_vessel = len(vessels)
         self.nr_berth = len(berths)
+        self._vessel_position = {}  # vessel id -> index in self.vessels
+        self._berth_position = {}  # berth id -> index in self.berths
+        self.freeze_time = None  # the vessels that are not frozen start from this time on, see freeze
     
     @classmethod
-    def from_file(cls, filename):
+    def from_file(cls, filename, cache_dir=None):
         """
         use data from file to create a problem model
         Parameters
@@ -34,45 +39,35 @@ class vessel_allocation_problem:
             DESCRIPTION.
         filename : TYPE string
             DESCRIPTION. name of the file from which the data are read
+        cache_dir : TYPE string, optional
+            DESCRIPTION. directory of the binary cache of the parsed data, see load_instance
 
         Returns
         -------
         TYPE problem object
         DESCRIPTION. a problem model
         """
-        with open(filename, 'r') as raw_data:
-            data = raw_data.read().splitlines()
-            nrVes = int(data[0])  # nr of vessels
-            nrBer = int(data[1])  # nr of berths
-            arrVes = [int(i) for i in data[2].split()]  # arrival time of vessels
-            openBer = [int(i) for i in data[3].split()]  # open time of berths
-            handling = []
-            for i in range(4, 4 + nrVes):
-                handling.append([int(j) for j in data[i].split()])  # handling time of each vessel in each berth
-            closeBer = [int(i) for i in data[4 + nrVes].split()]  # closing time of berths
-            closeVes = [int(i) for i in data[5 + nrVes].split()]  # closing time of vessels
-            costVes = [float(i) for i in data[6 + nrVes].split()]  # cost per unit time per vessel
-            
-            vessels = []
-            berths = []
-            # create vessels
-            for i in range(nrVes):
-                v = vessel(arrVes[i], closeVes[i], handling[i], costVes[i])
-                
-                # check if the vessel is possible to be served
-                can_be_served = False
-                for j in range(len(v.handling_time)):
-                    if v.arrival + v.handling_time[j] <= v.leaving:
-                        can_be_served = True
-                if can_be_served:   
-                    vessels.append(v)
-                else:
-                    print(f"{v.id} cannot be served by any berth")
-                    nrVes -= 1
-            # create berths
-            for i in range(nrBer):
-                berths.append(berth(openBer[i], closeBer[i]))
-            return cls(vessels, berths)
+        data = load_instance(filename, cache_dir)
+        arrVes = data["arrival"].tolist()
+        closeVes = data["leaving"].tolist()
+        handling = data["handling"].tolist()
+        costVes = data["cost"].tolist()
+        # a vessel can be served if it fits in its time window on at least one berth
+        can_be_served = (data["arrival"][:, None] + data["handling"] <= data["leaving"][:, None]).any(axis=1)
+
+        vessels = []
+        berths = []
+        # create vessels
+        for i in range(len(arrVes)):
+            v = vessel(arrVes[i], closeVes[i], handling[i], costVes[i], i)
+            if can_be_served[i]:
+                vessels.append(v)
+            else:
+                print(f"{v.id} cannot be served by any berth")
+        # create berths
+        for i, (start, close) in enumerate(zip(data["berth_open"].tolist(), data["berth_close"].tolist())):
+            berths.append(berth(start, close, i))
+        return cls(vessels, berths)
     
     def __eq__(self, rhs):
         """
@@ -98,6 +93,25 @@ class vessel_allocation_problem:
             return True  # if all the vessels with same id have same berth and starting time              
         else: return False  # if two solutions have different number of vessels
             
+    def total_cost(self):
+        """
+        the total cost of all vessels, the sum of the cached costs of the berths, so only the
+        berths changed since the last call are visited again. Vessels that are not allocated
+        (e.g. left over by replan) cost nothing, as in solution_state.recompute_cost
+
+        Returns
+        -------
+        TYPE float
+        """
+        if sum(len(b.vessels) for b in self.berths) != len(self.vessels):
+            # vessels out of the berths count with their own leaving time
+            return sum((v.real_leaving_time - v.arrival) * v.cost for v in self.vessels
+                       if v.is_allocated)
+        total_cost = 0.0
+        for b in self.berths:
+            total_cost += b.total_cost()
+        return total_cost
+
     def all_allocated(self):
         """
         for debugging
@@ -113,14 +127,14 @@ class vessel_allocation_problem:
         return True, -2
     
     def get_berth(self, berthID):
-        for b in self.berths:
-            if b.id == berthID:
-                return b
+        ind = self.berth_index(berthID)
+        if ind is not None:
+            return self.berths[ind]
     
     def get_vessel(self, vesselID):
-        for v in self.vessels:
-            if v.id == vesselID:
-                return v
+        ind = self.vessel_index(vesselID)
+        if ind is not None:
+            return self.vessels[ind]
     
     def print_solution(self):
         print("vessel id\tberth_id\tstar_time\tleaving_time\thandling_time")
@@ -161,7 +175,7 @@ class vessel_allocation_problem:
                 return b, start_time
         return None, start_time  # if no available berth, return none and -1
     
-    def nearest_available_berth(self, vessel):
+    def nearest_available_berth(self, vessel, release=None):
         """
         find out the time window among all berths for the vessel, that makes the operation
         to start as early as possible. 
@@ -170,6 +184,8 @@ class vessel_allocation_problem:
         ----------
         vessel : TYPE vessel object
             DESCRIPTION.  the vessel that needs to be allocated
+        release : TYPE list of int, optional
+            DESCRIPTION. the earliest start in each berth, see detach_unfrozen
 
         Returns
         -------
@@ -181,7 +197,8 @@ class vessel_allocation_problem:
         first_berth = None
         start_times = []  
         for i in range(len(self.berths)):  # loop over berths
-            op, slot_ind = self.berths[i].first_available_slot(vessel)
+            op, slot_ind = self.berths[i].first_available_slot(
+                vessel, None if release is None else release[i])
             start_times.append(op)
         
         first_berth = self.berths[np.argmin(start_times)]  # select the earliest start time
@@ -239,12 +256,16 @@ class vessel_allocation_problem:
         Returns
         -------
         i : TYPE int
-            DESCRIPTION. the index of the vessel in the list
+            DESCRIPTION. the index of the vessel in the list, None if not found
 
         """
-        for i in range(len(self.vessels)):
-            if self.vessels[i].id == vessel_id:
-                return i
+        return _lookup(self.vessels, self._vessel_position, vessel_id)
+    
+    def berth_index(self, berth_id):
+        """
+        search berth by id and return the index in the berths list of the problem
+        """
+        return _lookup(self.berths, self._berth_position, berth_id)
      
     def reset(self):
         """
@@ -257,15 +278,332 @@ class vessel_allocation_problem:
                 b.remove_vessel(b.vessels[0])  # always remove the first one in the list, 
                                                # since its size changes    
                                                
+    def pin_vessel(self, vessel_id):
+        """
+        keep the vessel in its berth at its start time: the solvers, the construction
+        heuristics and the re-planning do not move it, nor the vessels in front of it in
+        its berth (see solution_state.freeze)
+        """
+        self.get_vessel(vessel_id).pinned = True
+
+    def unpin_vessel(self, vessel_id):
+        self.get_vessel(vessel_id).pinned = False
+
+    def freeze(self, time):
+        """
+        freeze the plan before the time, e.g. the current time of a rolling horizon: every
+        vessel whose operation starts before it is pinned, and the other vessels cannot
+        start before it
+
+        Parameters
+        ----------
+        time : TYPE int
+        """
+        self.freeze_time = time
+        for v in self.vessels:
+            if v.is_allocated and v.operation_start < time:
+                v.pinned = True
+
+    def unfreeze(self):
+        """
+        unpin all vessels and remove the freeze time
+        """
+        self.freeze_time = None
+        for v in self.vessels:
+            v.pinned = False
+
+    def frozen_part(self, b):
+        """
+        the frozen vessels of a berth: all vessels up to its last pinned vessel, in
+        operation order, as the frozen part of solution_state
+
+        Parameters
+        ----------
+        b : TYPE berth object
+
+        Returns
+        -------
+        TYPE list of vessels
+        release : TYPE int
+            DESCRIPTION. the earliest start of the other vessels in the berth
+        """
+        allocated = sorted(b.vessels, key=lambda x : x.operation_start)
+        n = max((k + 1 for k, v in enumerate(allocated) if v.pinned), default=0)
+        release = allocated[n - 1].real_leaving_time if n > 0 else b.start
+        if self.freeze_time is not None:
+            release = max(release, self.freeze_time)
+        return allocated[:n], release
+
+    def detach_unfrozen(self):
+        """
+        take every vessel that is not frozen (see frozen_part) out of its berth, e.g. before
+        a construction heuristic allocates the vessels again. Without pinned vessels all
+        vessels are taken out, as in reset.
+
+        Returns
+        -------
+        release : TYPE list of int
+            DESCRIPTION. the earliest start of the vessels in each berth, the construction
+                heuristics do not use the free slots before it
+        """
+        release = []
+        for b in self.berths:
+            frozen, t = self.frozen_part(b)
+            b.sort_vessels()  # the frozen vessels are the first ones
+            for v in b.detach_suffix(len(frozen)):
+                v.reset()
+            release.append(t)
+        return release
+
+    def update_arrival(self, vessel_id, arrival, improve_iter=500, rng=None):
+        """
+        re-plan the allocation after the arrival time of a vessel has changed. Only the
+        vessel is taken out and inserted again (see replan), the others keep their order.
+        A frozen vessel cannot be updated (see frozen_part), unpin it first.
+
+        Parameters
+        ----------
+        vessel_id : TYPE string
+        arrival : TYPE int
+            DESCRIPTION. the new arrival time
+        improve_iter, rng :
+            DESCRIPTION. see replan
+
+        Returns
+        -------
+        TYPE list of vessels
+            DESCRIPTION. the vessels that could not be allocated again, usually empty
+
+        Raises
+        ------
+        ValueError
+            DESCRIPTION. if the vessel is frozen
+        """
+        v = self.get_vessel(vessel_id)
+        self._take_out(v)
+        v.arrival = arrival
+        return self.replan([v], improve_iter, rng)
+
+    def update_handling_time(self, vessel_id, handling_time, improve_iter=500, rng=None):
+        """
+        re-plan the allocation after the handling times of a vessel have changed,
+        see update_arrival
+
+        Parameters
+        ----------
+        handling_time : TYPE list of int, length = nr of berths
+            DESCRIPTION. the new handling time of the vessel in each berth, 200 if forbidden
+        """
+        v = self.get_vessel(vessel_id)
+        self._take_out(v)
+        v.handling_time = list(handling_time)
+        return self.replan([v], improve_iter, rng)
+
+    def add_call(self, arrival, leaving, handling_time, cost, improve_iter=500, rng=None):
+        """
+        add a new vessel to the problem and allocate it, see update_arrival
+
+        Returns
+        -------
+        v : TYPE vessel object
+            DESCRIPTION. the new vessel, its index is one more than the largest index so far
+        TYPE list of vessels
+            DESCRIPTION. the vessels that could not be allocated
+        """
+        index = max((x.index for x in self.vessels), default=-1) + 1
+        v = vessel(arrival, leaving, list(handling_time), cost, index)
+        self.vessels.append(v)
+        self.nr_vessel += 1
+        return v, self.replan([v], improve_iter, rng)
+
+    def cancel_call(self, vessel_id, improve_iter=500, rng=None):
+        """
+        remove a vessel from the problem; the vessels behind it in its berth move forward
+        and the allocation is improved, see replan. A frozen vessel cannot be cancelled,
+        see update_arrival
+        """
+        v = self.get_vessel(vessel_id)
+        self._take_out(v)
+        self.vessels.remove(v)
+        self.nr_vessel -= 1
+        return self.replan([], improve_iter, rng)
+
+    def close_berth(self, berth_id, close_time=None, improve_iter=500, rng=None):
+        """
+        close a berth earlier than planned. The vessels of the berth that would leave after
+        the new closing time are re-allocated, see update_arrival
+
+        Parameters
+        ----------
+        berth_id : TYPE string
+        close_time : TYPE int, optional
+            DESCRIPTION. the new closing time, the berth is closed completely if None
+
+        Raises
+        ------
+        ValueError
+            DESCRIPTION. if a frozen vessel of the berth (see frozen_part) would leave after
+                the closing time
+        """
+        b = self.get_berth(berth_id)
+        close_time = b.start if close_time is None else max(close_time, b.start)
+        frozen, release = self.frozen_part(b)
+        if frozen and frozen[-1].real_leaving_time > close_time:
+            raise ValueError(f"{b.id} cannot close at {close_time}, its frozen vessels leave "
+                             f"until {frozen[-1].real_leaving_time}")
+        b.sort_vessels()  # the vessels after the frozen part are the last ones
+        ind = next((i for i, v in enumerate(b.vessels) if v.real_leaving_time > close_time),
+                   len(b.vessels))
+        displaced = b.detach_suffix(ind)
+        for v in displaced:
+            v.reset()
+        b.close = min(b.close, close_time)
+        b.schedule.truncate(b.close)
+        return self.replan(displaced, improve_iter, rng)
+
+    def _take_out(self, v):
+        """
+        take a vessel out of its berth before an update. The vessels behind it move forward
+        as in solution_state.remove_vessel, so not before the release time of the berth,
+        and the frozen vessels keep their start times (berth.remove_vessel would move
+        all vessels behind the removed one).
+
+        Raises
+        ------
+        ValueError
+            DESCRIPTION. if the vessel is in the frozen part of its berth
+        """
+        if not v.is_allocated:
+            return
+        frozen, release = self.frozen_part(v.berth)
+        if any(v is x for x in frozen):
+            raise ValueError(f"{v.id} is frozen in {v.berth.id}, unpin it first")
+        from solution_state import solution_state  # imported here, see replan
+        state = solution_state.from_problem(self)
+        state.remove_vessel(next(i for i, x in enumerate(self.vessels) if x is v))
+        state.write_to(self)
+
+    def replan(self, vessels, improve_iter=500, rng=None):
+        """
+        repair the allocation after an update: the unallocated vessels are inserted one by
+        one, by arrival, at the position with the lowest cost increase over all berths that
+        squeezes out no other vessel (see operators.insertion_costs), behind the frozen part
+        of the berths (see freeze). The rest of the allocation is not touched. Then a short
+        local search, started from the repaired allocation, improves it in place.
+
+        Parameters
+        ----------
+        vessels : TYPE list of vessels
+            DESCRIPTION. the vessels to allocate
+        improve_iter : TYPE int, optional
+            DESCRIPTION. iterations of the local search, 0 to skip it
+        rng : TYPE numpy.random.Generator or int, optional
+            DESCRIPTION. the random number generator of the local search, or a seed
+
+        Returns
+        -------
+        not_allocated : TYPE list of vessels
+            DESCRIPTION. the vessels that fit nowhere without moving other vessels. They stay
+                in the problem without allocation and cost nothing in total_cost; the rest
+                of the allocation is still improved and remains valid
+        """
+        # imported here, the solvers are built on the problem objects and not the other way round
+        from solution_state import solution_state
+        from operators import insertion_costs
+        from solving_functions import local_search
+        state = solution_state.from_problem(self)
+        position = {id(v): i for i, v in enumerate(self.vessels)}  # vessel object -> index
+        not_allocated = []
+        for v in sorted(vessels, key=lambda x : x.arrival):
+            v.pinned = False  # it has lost its allocation
+            best_delta, best_index = insertion_costs(state, [position[id(v)]])
+            b = int(np.argmin(best_delta[0]))
+            if np.isfinite(best_delta[0, b]):
+                state.insert_vessel(position[id(v)], b, int(best_index[0, b]))
+            else:
+                not_allocated.append(v)
+        if improve_iter > 0:
+            state = local_search(state, improve_iter, rng)
+        state.write_to(self)
+        return not_allocated
+
     def debug(self):
         for v in self.vessels:
             if not v.berth:
                 return 0
             return 1
     
+def _lookup(items, position, item_id):
+    """
+    find the index of an item by id through the position dict. The dict is rebuilt if the 
+    list has been changed from outside (sorted, appended, ...) since it was built.
+    """
+    ind = position.get(item_id)
+    if ind is None or ind >= len(items) or items[ind].id != item_id:
+        position.clear()
+        position.update((x.id, i) for i, x in enumerate(items))
+        ind = position.get(item_id)
+    return ind
+    
+def load_instance(filename, cache_dir=None):
+    """
+    read the data of a scenario file (see Format.txt). The whole file is parsed by numpy at
+    once. With a cache directory, the parsed arrays are also stored there as .npz under the
+    sha1 of the file content, and later loads of the same content read the .npz instead.
+
+    Parameters
+    ----------
+    filename : TYPE string
+        DESCRIPTION. the scenario file
+    cache_dir : TYPE string, optional
+        DESCRIPTION. directory of the cache, no cache if None
+
+    Raises
+    ------
+    ValueError
+        DESCRIPTION. if the file does not have the layout of Format.txt
+
+    Returns
+    -------
+    TYPE dict of arrays
+        DESCRIPTION. arrival, leaving, cost (one per vessel), handling (vessels x berths),
+            berth_open and berth_close (one per berth)
+    """
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = os.path.join(cache_dir, hashlib.sha1(raw).hexdigest() + ".npz")
+        if os.path.exists(cache_file):
+            with np.load(cache_file) as cached:
+                return {k: cached[k] for k in cached.files}
+
+    values = np.fromstring(raw.decode(), dtype=np.float64, sep=" ")
+    if len(values) < 2:
+        raise ValueError(f"{filename} is not a scenario file")
+    nrVes, nrBer = int(values[0]), int(values[1])
+    sizes = [("arrival", nrVes), ("berth_open", nrBer), ("handling", nrVes * nrBer),
+             ("berth_close", nrBer), ("leaving", nrVes), ("cost", nrVes)]
+    if len(values) != 2 + sum(n for _, n in sizes):
+        raise ValueError(f"{filename} does not have the layout of Format.txt")
+    data = {}
+    first = 2
+    for name, n in sizes:
+        data[name] = values[first:first + n]
+        first += n
+    for name in ["arrival", "berth_open", "handling", "berth_close", "leaving"]:
+        data[name] = data[name].astype(np.int64)
+    data["handling"] = data["handling"].reshape(nrVes, nrBer)
+
+    if cache_file is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, **data)
+        os.replace(tmp, cache_file)  # atomic, workers may write the same entry at once
+    return data
+
 class vessel:
-    new_id = itertools.count().__next__
-    def __init__(self, arrival, leaving, handling_time, cost):
+    def __init__(self, arrival, leaving, handling_time, cost, index):
         """
         Parameters
         ----------
@@ -277,8 +615,11 @@ class vessel:
             DESCRIPTION. the handling time the vessel need on each berth
         cost : TYPE float
             DESCRIPTION. the cost of the vessel per unit time
+        index : TYPE int
+            DESCRIPTION. the number of the vessel, i.e. its row in the data file
         """
-        self.id = f'vessel_{vessel.new_id()}'
+        self.index = index
+        self.id = f'vessel_{index}'
         self.arrival = arrival  # arrival time of the time window
         self.leaving = leaving  # leaving time of the time window
         self.handling_time = handling_time  # list of handling time in each berth
@@ -288,6 +629,7 @@ class vessel:
         self.real_handling_time = 200  # the certain handling time after the vessel is allocated to a berth
         self.real_leaving_time = 700  # the certain leaving time after the vessel is allocated to a berth
         self.is_allocated = False  # a bool value indicating if a vessel has been allocated
+        self.pinned = False  # the vessel keeps its allocation, see vessel_allocation_problem.pin_vessel
     
     def reset(self):
         self.berth = None
@@ -298,8 +640,7 @@ class vessel:
         
         
 class berth:
-    new_id = itertools.count().__next__
-    def __init__(self, start, close):
+    def __init__(self, start, close, index):
         
         """
         Parameters
@@ -308,13 +649,19 @@ class berth:
             DESCRIPTION. start time of the berth
         close : TYPE int
             DESCRIPTION. close time of the berth
+        index : TYPE int
+            DESCRIPTION. the number of the berth, i.e. its column in the handling time matrix
         """
-        self.id = f'berth_{berth.new_id()}'
+        self.index = index
+        self.id = f'berth_{index}'
         self.start = start
         self.close = close
-        self.schedule = [[start, close]]  # list of available time slots, 
+        self.schedule = free_slots(start, close)  # available time slots, 
                                 # initialized by schedule for an empty berth
         self.vessels = []  # the list of vessels 
+        self._position = {}  # vessel id -> index in self.vessels, kept up to date by 
+                             # add_vessel, remove_vessel and insert_vessel
+        self._cost = 0.0  # cost of the vessels in the berth, None when it has to be recalculated
         
     def add_vessel(self, vessel, start_time):
         """
@@ -333,15 +680,18 @@ class berth:
         """
         if (not self.is_vessel_in(vessel)): 
             slot_ind = self.to_slot_ind(start_time)
-            if (start_time + vessel.handling_time[int(self.id[6:])] <= self.schedule[slot_ind][1]
-                and start_time + vessel.handling_time[int(self.id[6:])] <= vessel.leaving):
+            if (slot_ind != -1
+                and start_time + vessel.handling_time[self.index] <= self.schedule[slot_ind][1]
+                and start_time + vessel.handling_time[self.index] <= vessel.leaving):
+                self._position[vessel.id] = len(self.vessels)
                 self.vessels.append(vessel)
                 vessel.berth = self  # set the berth attribute of the vessel
                 vessel.operation_start = start_time  # set the attribute value for the vessel
-                vessel.real_handling_time = vessel.handling_time[int(self.id[6:])]
+                vessel.real_handling_time = vessel.handling_time[self.index]
                 vessel.real_leaving_time = vessel.operation_start + vessel.real_handling_time
                 vessel.is_allocated = True
                 self.calc_slot(slot_ind, start_time, vessel.real_handling_time)     
+                self._cost = None
             else:
                 #print(f"Cannot add! {vessel.id} violates the time constraint")
                 return vessel                
@@ -367,31 +717,65 @@ class berth:
 
 
         """
-        op_start = 0
-        if (index >= len(self.vessels)):  # if the vessel is inserted in the last place
-            op_start = max(inserted.arrival, self.vessels[-1].real_leaving_time)
-            real_leaving = op_start + inserted.handling_time[int(self.id[6:])]
-            if (real_leaving > self.close or real_leaving > inserted.leaving):
-                return False
-            else:
-                return True
-        elif index <= 0:
-            index = 0
-            op_start = max(self.start, inserted.arrival)  
-        else:  # if index is in the range(len(self.vessels))
-            op_start = max(self.vessels[index - 1].real_leaving_time, inserted.arrival)          
-        pre_leaving = op_start + inserted.handling_time[int(self.id[6:])]  # leaving time of the previous vessel
-        for i in range(index, len(self.vessels)):
-            # calculate whether the violate the time constrant one by one if insert the vessel
-            v = self.vessels[i]  # the vessel in the list
-            op_start = max(pre_leaving, v.arrival)  # update the operation start time
-            pre_leaving = op_start + v.handling_time[int(self.id[6:])]
-            if pre_leaving > v.leaving:
-                return False # if any violation of the time constraint
-        if pre_leaving > self.close:
-            return False  # if the last vessel leave later than the closing time of the berth
-        else:
-            return True
+        feasible, start_times, cost_delta = self.propose_insert(inserted, index)
+        return feasible
+    
+    def propose_insert(self, inserted, index):
+        """
+        evaluate the insertion of a vessel in the index without changing the berth
+
+        Parameters
+        ----------
+        inserted : TYPE  vessel object 
+            DESCRIPTION. vessel that is going to be inserted
+        index : TYPE int
+            DESCRIPTION. the index to which the vessel is inserted
+
+        Returns
+        -------
+        see propose_suffix
+        """
+        index = min(max(index, 0), len(self.vessels))
+        return self.propose_suffix(index, [inserted] + self.vessels[index:])
+    
+    def propose_suffix(self, index, suffix):
+        """
+        evaluate a new sequence of vessels from the index on, without changing the berth or
+        the vessels. The vessels before the index keep their schedule, the vessels in the 
+        suffix are served one after another as early as possible.
+
+        Parameters
+        ----------
+        index : TYPE int
+            DESCRIPTION. the index from which the vessels are replaced by the suffix
+        suffix : TYPE list of vessel objects
+            DESCRIPTION. the new vessels sequence behind the first index vessels
+
+        Returns
+        -------
+        TYPE  boolean
+            DESCRIPTION. True if all vessels in the suffix fit their time windows and the 
+                closing time of the berth; False otherwise
+        start_times : TYPE list of int
+            DESCRIPTION. the operation start time of each vessel in the suffix, 
+                None if not feasible
+        cost_delta : TYPE float
+            DESCRIPTION. the change of the total cost if the suffix is applied, a vessel 
+                that was not allocated before adds its whole cost. None if not feasible
+        """
+        pre_leaving = self.vessels[index - 1].real_leaving_time if index > 0 else self.start
+        start_times = []
+        cost_delta = 0.0
+        for v in suffix:
+            handling = v.handling_time[self.index]
+            op_start = max(pre_leaving, v.arrival)
+            pre_leaving = op_start + handling
+            if handling == 200 or pre_leaving > v.leaving or pre_leaving > self.close:
+                return False, None, None  # if any violation of the time constraint
+            start_times.append(op_start)
+            old_leaving = v.real_leaving_time if v.is_allocated else v.arrival
+            cost_delta += (pre_leaving - old_leaving) * v.cost
+        return True, start_times, cost_delta
             
     def remove_vessel(self, vessel):
         """
@@ -415,11 +799,7 @@ class berth:
 
         if (self.is_vessel_in(vessel)):
             remove_ind = self.vessel_index(vessel.id)
-            sublist = self.vessels[remove_ind:]
-            # first remove all vessels in the sublist
-            for i in range(len(sublist)):
-                self.vessels.remove(sublist[i])
-                self.restore_schedule(sublist[i])  # recalculate the schedule after remove the vessel
+            sublist = self.detach_suffix(remove_ind)  # first remove all vessels in the sublist
             if (len(sublist) > 1):
                 # add back vessels except the vessel that we want to remove   
                 op_start = max(self.schedule[-1][0], sublist[1].arrival) 
@@ -463,8 +843,9 @@ class berth:
         squeezed_out = []  # for storing the vessels that cannot fit the schedule after the insertion
         if (before_ind >= len(self.vessels)):
             if (not inserted.is_allocated):
-                target_slot = self.schedule[-1]  # the last time slot of the berth
-                start_time = max(inserted.arrival, target_slot[0])
+                # the last time slot of the berth, a closed berth has none and adds nothing
+                last_start = self.schedule[-1][0] if len(self.schedule) else self.close
+                start_time = max(inserted.arrival, last_start)
                 not_added = self.add_vessel(inserted, start_time)  # if the index out of range, add the vessel to the end of the list
                 if not_added:
                     not_added.reset()
@@ -476,16 +857,12 @@ class berth:
             before_which = self.vessels[before_ind]  # the vessel before which the insertion should be
             if (self.is_vessel_in(before_which) and not inserted.is_allocated):
                 before_ind =  self.vessel_index(before_which.id)
-                sublist = self.vessels[before_ind:] 
-                # first remove all vessels in the sublist
-                for i in range(len(sublist)):
-                    self.vessels.remove(sublist[i])
-                    self.restore_schedule(sublist[i])  # recalculate the schedule after remove the vessel
+                sublist = self.detach_suffix(before_ind)  # first remove all vessels in the sublist
                 # add back vessels including the vessel that is to be inserted
                 sublist.insert(0, inserted)  # insert the inserted vessel to the first place of the list
                 op_start = max(self.schedule[-1][0], sublist[0].arrival)  # calculate the earlist start time
                 for i in range(len(sublist)):
-                    handling = sublist[i].handling_time[int(self.id[6:])]
+                    handling = sublist[i].handling_time[self.index]
                     leaving = sublist[i].leaving
                     if (op_start + handling <= leaving
                         and op_start + handling <= self.close):  # check if the time still fit for the vessel
@@ -518,7 +895,59 @@ class berth:
             DESCRIPTION. if the input vessel is in the berth, returns True; 
                 otherwise, False.
         """
-        return vessel in self.vessels
+        ind = self._position.get(vessel.id)
+        return ind is not None and self.vessels[ind] is vessel
+    
+    def detach_suffix(self, index):
+        """
+        take all vessels from the index on out of the berth and give their time back to the
+        schedule. The attributes of the vessels are not changed.
+
+        Parameters
+        ----------
+        index : TYPE int
+            DESCRIPTION. index of the first vessel that is taken out
+
+        Returns
+        -------
+        sublist : TYPE list of vessels
+            DESCRIPTION. the vessels that are taken out, in the original order
+        """
+        sublist = self.vessels[index:]
+        del self.vessels[index:]
+        self._cost = None
+        for v in sublist:
+            del self._position[v.id]
+            self.restore_schedule(v)  # recalculate the schedule after remove the vessel
+        return sublist
+    
+    def sort_vessels(self):
+        """
+        sort the vessel list by operation start time and update the index
+        """
+        self.vessels.sort(key=lambda x : x.operation_start)
+        self._position = {v.id: i for i, v in enumerate(self.vessels)}
+    
+    def clear(self):
+        """
+        empty the berth without touching the vessels' attributes
+        """
+        self.vessels = []
+        self._position = {}
+        self._cost = 0.0
+        self.schedule = free_slots(self.start, self.close)
+    
+    def total_cost(self):
+        """
+        the cost of the vessels in the berth. It is cached and only recalculated after 
+        add_vessel or detach_suffix (so also remove_vessel, insert_vessel and the swaps)
+        changed the berth.
+        """
+        if self._cost is None:
+            self._cost = 0.0
+            for v in self.vessels:
+                self._cost += (v.real_leaving_time - v.arrival) * v.cost
+        return self._cost
     
     def print_vessels(self):
         """
@@ -541,20 +970,11 @@ class berth:
         Returns
         -------
         slot_ind : TYPE int
-            DESCRIPTION. the index of the time slot which the start time is in.
+            DESCRIPTION. the index of the time slot which the start time is in, 
+                -1 if not found
 
         """
-        slot_ind = None
-        for i in range(len(self.schedule)):
-            if (self.schedule[i][0] <= start_time 
-                and self.schedule[i][1] > start_time):
-                slot_ind = i
-                break
-        if (slot_ind != -1):
-            return slot_ind
-        else:
-            # if the time slot is not available
-            return -1
+        return self.schedule.find(start_time)  # -1 if the time slot is not available
    
     def vessel_index(self, vessel_id):
         """
@@ -568,12 +988,10 @@ class berth:
         Returns
         -------
         i : TYPE int
-            DESCRIPTION. the index of the vessel in the list
+            DESCRIPTION. the index of the vessel in the list, None if not found
 
         """
-        for i in range(len(self.vessels)):
-            if self.vessels[i].id == vessel_id:
-                return i
+        return self._position.get(vessel_id)
             
     def first_feasible_start_time(self, vessel):
         """
@@ -604,13 +1022,13 @@ class berth:
             arrival = vessel.arrival
             op_start = max(arrival, last_slot[0])
             leaving = vessel.leaving
-            handling = vessel.handling_time[int(self.id[6:])]
+            handling = vessel.handling_time[self.index]
             if op_start + handling <= min(leaving, last_slot[1], self.close):
                 return len(self.vessels), op_start
             else:   return -1, 500
                 
                 
-    def first_available_slot(self, vessel):
+    def first_available_slot(self, vessel, earliest=None):
         """
         find out the first available start time and slot in the current berth, given a vessel
 
@@ -618,6 +1036,8 @@ class berth:
         ----------
         vessel : TYPE vessel object
             DESCRIPTION.  the vessel that is looking for a time slot in the berth
+        earliest : TYPE int, optional
+            DESCRIPTION. the operation cannot start before this time, nor before the arrival
 
         Returns
         -------
@@ -625,21 +1045,16 @@ class berth:
             DESCRIPTION. 1. returns the earliest staring time in this berth for the vessel
                     2. returns the index of the first available slot in the berth
         """
-        arrival_time = vessel.arrival
-        schedule = self.schedule
-        handling = vessel.handling_time[int(self.id[6:])]        
+        handling = vessel.handling_time[self.index]        
         if (handling == 200):               
             return 500, -1  # if current berth is not allowed, return a very late start time and slot int -1    
-        elif (len(schedule)):  # if the schedule list is not empty                
-            for j in range(len(schedule)):
-                tw = schedule[j]  # the time window
-                op = max(arrival_time, tw[0])  # if vessel is in the slot, the opeartion start time
-                if (op + handling <= tw[1]
-                    and op + handling <= vessel.leaving): 
-                    # the operation should be ended before the end of the time window
-                    # as well as the vessel's leaving time
-                    return op, j        
+        # the operation should be ended before the end of the time window
+        # as well as the vessel's leaving time
+        earliest = vessel.arrival if earliest is None else max(vessel.arrival, earliest)
+        op, j = self.schedule.first_fit(earliest, handling, vessel.leaving)
+        if j == -1:
             return 500, -1  # if no available slot found, return large start time and index -1
+        return op, j
     
     def calc_slot(self, slot_ind, start_time, handling_time):
         """
@@ -662,14 +1077,8 @@ class berth:
         """
         if (start_time >= self.schedule[slot_ind][0] 
             and start_time + handling_time <= self.schedule[slot_ind][1]):
-            select_slot = self.schedule[slot_ind]  # the time slot into which the vessel is assigned
-            insert_slot = [[select_slot[0], start_time], 
-                           [start_time + handling_time, select_slot[1]]]
-            for s in insert_slot:
-                if s[0] != s[1]:  # if the slot length is not 0
-                    self.schedule.insert(0, s)
-            self.schedule.remove(select_slot)
-            self.schedule.sort()  # sort the list by the start time of slots
+            # split the selected slot around the operation, empty parts are dropped
+            self.schedule.occupy(slot_ind, start_time, start_time + handling_time)
         else:  
             # if the vessel's starting or handling time does not match the selected slot
             raise Exception(f"Impossible to allocate this vessel into time window {slot_ind} of {self.id}")
@@ -683,32 +1092,5 @@ class berth:
         vessel : TYPE  vessel object
             DESCRIPTION.  the vessel that is removed from the berth
         """
-        start = vessel.operation_start  # the operation start time
-        end = vessel.real_leaving_time  # the operation end time
-        self.schedule.insert(0, [start, end])
-        self.schedule.sort()  # sort the schedule list according to starting time
-        ind_new = self.to_slot_ind(start)  # the index of the newly added time slot
-        
-        if (ind_new != 0 
-            and self.schedule[ind_new - 1][1] == start):
-            # if the new slot is not the first slot and it has no gap with its previous slot
-            prev = self.schedule[ind_new - 1]  # the previous time slot
-            merged = [prev[0], end]  # merged slot with the previous one
-            self.schedule.remove(prev)  # remove previous time slot
-            self.schedule.remove([start, end])  # remove the newly added time slot
-            self.schedule.insert(0, merged)  # insert the the merged time slot
-            start = merged[0]  # update the start time of the newly added time slot
-            end = merged[1]  # update the end time of the newly added time slot
-            self.schedule.sort()  # sort the schedule by the starting time
-            ind_new -= 1  # update the index of the newly added slot
-       
-        if (ind_new != len(self.schedule) - 1 
-            and self.schedule[ind_new + 1][0] == end):
-            # if the slot is not the last time slot and it has no gap with the next slot
-            next = self.schedule[ind_new + 1]  # the next time slot
-            merged = [start, next[1]]  # the merged time slot
-            self.schedule.remove(next)
-            self.schedule.remove([start, end])
-            self.schedule.insert(0, merged)
-            self.schedule.sort()  # sort the schedule by the starting time
-        
\ No newline at end of file
+        # merged with the neighbor slots if there's no gap between them
+        self.schedule.release(vessel.operation_start, vessel.real_leaving_time)